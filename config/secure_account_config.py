@@ -75,6 +75,7 @@ class SecureAccountConfig:
             )
             self.account_info = {}
             self.account_mappings = {}
+            self.account_info_by_number = {}
             self.categories = {}
             return
 
@@ -85,6 +86,7 @@ class SecureAccountConfig:
             # Build account info and mappings
             self.account_info = {}
             self.account_mappings = {}
+            self.account_info_by_number = {}
             self.categories = {
                 "personal": [],
                 "trading": [],
@@ -119,6 +121,7 @@ class SecureAccountConfig:
 
                 self.account_info[alias] = account_info
                 self.account_mappings[alias] = account_number
+                self.account_info_by_number.setdefault(account_number, account_info)
 
                 # Add to category
                 if category in self.categories:
@@ -130,11 +133,13 @@ class SecureAccountConfig:
             logger.error(f"Invalid JSON in {ACCOUNTS_FILE}: {e}")
             self.account_info = {}
             self.account_mappings = {}
+            self.account_info_by_number = {}
             self.categories = {}
         except (OSError, TypeError, AttributeError, ValueError) as e:
             logger.error(f"Error loading account config: {e}")
             self.account_info = {}
             self.account_mappings = {}
+            self.account_info_by_number = {}
             self.categories = {}
 
     def get_account_number(self, alias: str) -> str | None:
@@ -147,10 +152,7 @@ class SecureAccountConfig:
 
     def get_account_info_by_number(self, account_number: str) -> AccountInfo | None:
         """Get account metadata by account number"""
-        for info in self.account_info.values():
-            if info.account_number == account_number:
-                return info
-        return None
+        return self.account_info_by_number.get(account_number)
 
     def get_accounts_by_category(self, category: str) -> list[str]:
         """Get account numbers by category"""
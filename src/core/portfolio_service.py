@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 
 from src.core.models import (
     AccountBalance,
@@ -74,17 +74,22 @@ def _build_position_record(
 
 
 def build_portfolio_summary_model(
-    accounts: list[dict],
+    accounts: Iterable[dict],
     account_name_resolver: AccountNameResolver,
     money_market_symbols: set[str] | frozenset[str],
 ) -> PortfolioSummary:
-    """Build a typed portfolio summary from account payloads."""
+    """Build a typed portfolio summary from account payloads.
+
+    ``accounts`` is consumed in a single pass, so a streaming iterator works too.
+    """
     total_value = 0.0
     total_cash = 0.0
     total_unrealized_pl = 0.0
+    account_count = 0
     all_positions: list[PositionSnapshot] = []
 
     for account_wrapper in accounts:
+        account_count += 1
         account = account_wrapper.get("securitiesAccount", {})
         balances = account.get("currentBalances", {})
         positions = account.get("positions", [])
@@ -123,14 +128,14 @@ def build_portfolio_summary_model(
         total_invested=total_value - total_cash,
         total_unrealized_pl=total_unrealized_pl,
         cash_percentage=(total_cash / total_value * 100) if total_value > 0 else 0.0,
-        account_count=len(accounts),
+        account_count=account_count,
         position_count=len(all_positions),
         positions=all_positions,
     )
 
 
 def build_portfolio_summary(
-    accounts: list[dict],
+    accounts: Iterable[dict],
     account_name_resolver: AccountNameResolver,
     money_market_symbols: set[str] | frozenset[str],
 ) -> dict:
@@ -143,7 +148,7 @@ def build_portfolio_summary(
 
 
 def build_positions_model(
-    accounts: list[dict],
+    accounts: Iterable[dict],
     account_name_resolver: AccountNameResolver,
     symbol: str | None = None,
     money_market_symbols: set[str] | frozenset[str] = frozenset(),
@@ -152,18 +157,21 @@ def build_positions_model(
     """Build typed position data across all accounts."""
     positions: list[PositionSnapshot] = []
     total_portfolio_value = 0.0
+    wanted_symbol = symbol.upper() if symbol else None
 
     for account in accounts:
         sec_account = account.get("securitiesAccount", {})
         balances = sec_account.get("currentBalances", {})
         total_portfolio_value += float(balances.get("liquidationValue", 0) or 0)
-
-    for account in accounts:
-        sec_account = account.get("securitiesAccount", {})
         account_number = sec_account.get("accountNumber", "")
         account_name = account_name_resolver(account_number)
 
         for raw_position in sec_account.get("positions", []):
+            if wanted_symbol:
+                raw_symbol = raw_position.get("instrument", {}).get("symbol", "")
+                if raw_symbol.upper() != wanted_symbol:
+                    continue
+
             position = _build_position_record(
                 raw_position,
                 account_number=account_number,
@@ -171,25 +179,22 @@ def build_positions_model(
                 money_market_symbols=money_market_symbols,
             )
 
-            if symbol and position.symbol.upper() != symbol.upper():
-                continue
-
             if not include_account_number:
                 position.account_number = None
-
-            position.percentage_of_portfolio = (
-                position.market_value / total_portfolio_value * 100
-                if total_portfolio_value > 0
-                else 0.0
-            )
             positions.append(position)
 
+    # Percentages need the portfolio total, which is only known after the single pass.
+    for position in positions:
+        position.percentage_of_portfolio = (
+            position.market_value / total_portfolio_value * 100 if total_portfolio_value > 0 else 0.0
+        )
+
     positions.sort(key=lambda position: position.market_value, reverse=True)
     return positions
 
 
 def build_positions(
-    accounts: list[dict],
+    accounts: Iterable[dict],
     account_name_resolver: AccountNameResolver,
     symbol: str | None = None,
     money_market_symbols: set[str] | frozenset[str] = frozenset(),
@@ -209,7 +214,7 @@ def build_positions(
 
 
 def build_account_balances_model(
-    accounts: list[dict],
+    accounts: Iterable[dict],
     account_name_resolver: AccountNameResolver,
     money_market_symbols: set[str] | frozenset[str],
 ) -> list[AccountBalance]:
@@ -257,7 +262,7 @@ def build_account_balances_model(
 
 
 def build_account_balances(
-    accounts: list[dict],
+    accounts: Iterable[dict],
     account_name_resolver: AccountNameResolver,
     money_market_symbols: set[str] | frozenset[str],
 ) -> list[dict]:
@@ -273,7 +278,7 @@ def build_account_balances(
 
 
 def build_account_snapshots_model(
-    accounts: list[dict],
+    accounts: Iterable[dict],
     account_name_resolver: AccountNameResolver,
     money_market_symbols: set[str] | frozenset[str],
 ) -> list[AccountSnapshot]:
@@ -326,7 +331,7 @@ def build_account_snapshots_model(
     return snapshots
 
 
-def analyze_allocation_model(accounts: list[dict]) -> AllocationAnalysis:
+def analyze_allocation_model(accounts: Iterable[dict]) -> AllocationAnalysis:
     """Analyze portfolio allocation and concentration risks."""
     total_value = 0.0
     symbol_values: dict[str, float] = {}
@@ -391,6 +396,6 @@ def analyze_allocation_model(accounts: list[dict]) -> AllocationAnalysis:
     )
 
 
-def analyze_allocation(accounts: list[dict]) -> dict:
+def analyze_allocation(accounts: Iterable[dict]) -> dict:
     """Analyze portfolio allocation and concentration risks."""
     return analyze_allocation_model(accounts).to_dict()
@@ -1,11 +1,12 @@
 """Internal client mixins and shared helpers."""
 
 from .common import MONEY_MARKET_SYMBOLS
-from .portfolio import PortfolioClientMixin
+from .portfolio import AccountsSnapshot, PortfolioClientMixin
 from .trading import TradingClientMixin
 
 __all__ = [
     "MONEY_MARKET_SYMBOLS",
+    "AccountsSnapshot",
     "PortfolioClientMixin",
     "TradingClientMixin",
 ]
@@ -4,15 +4,78 @@ from __future__ import annotations
 
 import logging
 import time
+from collections.abc import Iterable, Iterator
 from functools import wraps
 
 import httpx
 
+from src.core.json_types import JsonObject, JsonValue
+
+from .protocols import SchwabResponse
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Money market fund symbols treated as cash equivalents
 MONEY_MARKET_SYMBOLS = frozenset({"SWGXX", "SWVXX", "SNOXX", "SNSXX", "SNVXX"})
 
+# How long a fetched GET /accounts payload is reused across portfolio views
+ACCOUNTS_CACHE_TTL_SECONDS = 5.0
+
+# How long a fetched quote is served from memory before it is requested again
+QUOTE_CACHE_TTL_SECONDS = 2.0
+
+# Symbols per GET /quotes request, and the parallel request cap used when batching
+QUOTE_BATCH_SIZE = 500
+QUOTE_BATCH_MAX_WORKERS = 8
+
+# Parallel request cap when the same call is fanned out across every account
+ACCOUNT_FANOUT_MAX_WORKERS = 8
+
+# Delays (seconds) between re-checks of an accepted order whose status is still pending
+ORDER_STATUS_POLL_SCHEDULE = (0.1, 0.25, 0.5, 1.0)
+
+
+def _decode_json(response: SchwabResponse) -> JsonValue:
+    """Decode a response body, using orjson on the raw bytes when it is installed."""
+    content = getattr(response, "content", None)
+    if ORJSON_AVAILABLE and isinstance(content, bytes):
+        return orjson.loads(content)
+    return response.json()
+
+
+class _ChunkReader:
+    """Minimal file-like adapter so ijson can consume an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson probes the stream type with read(0); don't consume a chunk for it.
+        if size == 0:
+            return b""
+        return next(self._chunks, b"")
+
+
+def _iter_json_array_items(chunks: Iterable[bytes]) -> Iterator[JsonObject]:
+    """Incrementally yield the object items of a top-level JSON array."""
+    for item in ijson.items(_ChunkReader(chunks), "item", use_float=True):
+        if isinstance(item, dict):
+            yield item
+
 
 def _retry_on_transient_error(max_retries: int = 2, backoff_base: float = 1.0):
     """Retry on transient HTTP errors with exponential backoff."""
@@ -2,130 +2,518 @@
 
 from __future__ import annotations
 
-from src.core.json_types import JsonObject, as_json_array, as_json_object
+import json
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from src.core.json_types import JsonObject, JsonValue, as_json_array, as_json_object
 from src.core.portfolio_service import (
     analyze_allocation,
     build_account_balances,
     build_portfolio_summary,
     build_positions,
 )
+from src.schwab_client.secure_files import ensure_sensitive_dir, write_sensitive_json
+
+from .common import (
+    ACCOUNT_FANOUT_MAX_WORKERS,
+    ACCOUNTS_CACHE_TTL_SECONDS,
+    IJSON_AVAILABLE,
+    MONEY_MARKET_SYMBOLS,
+    QUOTE_BATCH_MAX_WORKERS,
+    QUOTE_BATCH_SIZE,
+    QUOTE_CACHE_TTL_SECONDS,
+    _decode_json,
+    _iter_json_array_items,
+    _retry_on_transient_error,
+    logger,
+)
+from .protocols import (
+    SchwabClientTransport,
+    SchwabResponse,
+    StreamingResponse,
+    TransactionTypeMember,
+)
 
-from .common import MONEY_MARKET_SYMBOLS, _retry_on_transient_error
-from .protocols import SchwabClientTransport
+ACCOUNTS_URL = "https://api.schwabapi.com/trader/v1/accounts"
+
+
+@dataclass(slots=True)
+class AccountsSnapshot:
+    """One decoded ``GET /accounts`` payload and when it was fetched."""
+
+    accounts: list[JsonObject]
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    def is_fresh(self, ttl: float = ACCOUNTS_CACHE_TTL_SECONDS) -> bool:
+        return time.monotonic() - self.fetched_at <= ttl
 
 
 class PortfolioClientMixin:
     """Mixin providing read-oriented Schwab account and quote methods."""
 
+    __slots__ = (
+        "_account_hashes",
+        "_accounts_cache",
+        "_display_names",
+        "_hash_cache_path",
+        "_hash_lock",
+        "_hashes_refreshed",
+        "_quote_cache",
+        "_quote_inflight",
+        "_quote_lock",
+        "_stream_accounts",
+        "_txn_type_map",
+    )
+
     _client: SchwabClientTransport
     _account_hashes: dict[str, str] | None
+    _hash_cache_path: Path | None
+    _hash_lock: threading.Lock
+    _hashes_refreshed: bool
+    _accounts_cache: AccountsSnapshot | None
+    _display_names: dict[str, str]
+    _quote_cache: dict[str, tuple[float, JsonValue]]
+    _quote_inflight: dict[str, threading.Event]
+    _quote_lock: threading.Lock
+    _positions_field: str
+    _stream_accounts: bool
+    _txn_type_map: dict[str, TransactionTypeMember] | None
 
     @_retry_on_transient_error()
-    def get_account_numbers(self) -> list[dict[str, str]]:
-        """Get account numbers with hash values."""
+    def _refresh_hashes(self) -> dict[str, str]:
+        """Fetch account numbers and replace the cached number -> hash mapping."""
         response = self._client.get_account_numbers()
         response.raise_for_status()
-        payload = as_json_array(response.json())
-        accounts = [account for account in payload if isinstance(account, dict)]
-        self._account_hashes = {
+        payload = as_json_array(_decode_json(response))
+        hashes = {
             str(account["accountNumber"]): str(account["hashValue"])
-            for account in accounts
-            if account.get("accountNumber") is not None and account.get("hashValue") is not None
+            for account in payload
+            if isinstance(account, dict)
+            and account.get("accountNumber") is not None
+            and account.get("hashValue") is not None
         }
+        self._account_hashes = hashes
+        self._hashes_refreshed = True
+        self._save_hash_cache(hashes)
+        return hashes
+
+    def _load_hash_cache(self) -> dict[str, str] | None:
+        path = self._hash_cache_path
+        if path is None or not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable account hash cache %s: %s", path, exc)
+            return None
+        if not isinstance(payload, dict):
+            return None
+        return {str(number): str(hash_value) for number, hash_value in payload.items()}
+
+    def _save_hash_cache(self, hashes: dict[str, str]) -> None:
+        path = self._hash_cache_path
+        if path is None:
+            return
+        try:
+            ensure_sensitive_dir(path.parent)
+            write_sensitive_json(path, hashes)
+        except OSError as exc:
+            logger.warning("Could not persist account hash cache %s: %s", path, exc)
+
+    def forget_account_hashes(self) -> None:
+        """Drop cached account hashes in memory and on disk (e.g. after a 404)."""
+        self._account_hashes = None
+        path = self._hash_cache_path
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def get_account_numbers(self) -> list[dict[str, str]]:
+        """Get account numbers with hash values."""
         return [
-            {
-                "accountNumber": str(account["accountNumber"]),
-                "hashValue": str(account["hashValue"]),
-            }
-            for account in accounts
-            if account.get("accountNumber") is not None and account.get("hashValue") is not None
+            {"accountNumber": number, "hashValue": hash_value}
+            for number, hash_value in self._refresh_hashes().items()
         ]
 
+    def _known_hashes(self) -> dict[str, str]:
+        hashes = self._account_hashes
+        if hashes is not None:
+            return hashes
+        # Double-checked so threads racing on first use share a single fetch.
+        with self._hash_lock:
+            hashes = self._account_hashes
+            if hashes is None:
+                hashes = self._load_hash_cache()
+                if hashes is not None:
+                    self._account_hashes = hashes
+            if hashes is None:
+                hashes = self._refresh_hashes()
+        return hashes
+
+    def _hashes_for(self, account_numbers: Iterable[str]) -> dict[str, str]:
+        """Return known hashes, refetching once if a number is missing from the disk cache.
+
+        Hashes fetched live by this client are authoritative, so later misses do
+        not trigger another request.
+        """
+        hashes = self._known_hashes()
+        if self._hashes_refreshed or all(number in hashes for number in account_numbers):
+            return hashes
+        with self._hash_lock:
+            if not self._hashes_refreshed:
+                return self._refresh_hashes()
+            return self._account_hashes or hashes
+
     def get_account_hash(self, account_number: str) -> str | None:
         """Get hash value for an account number."""
-        if self._account_hashes is None:
-            self.get_account_numbers()
-        return self._account_hashes.get(account_number) if self._account_hashes else None
+        return self._hashes_for((account_number,)).get(account_number)
+
+    def _send_for_account(
+        self, account_hash: str, send: Callable[[str], SchwabResponse]
+    ) -> SchwabResponse:
+        """Call ``send(account_hash)``, retrying once with a re-resolved hash after a 404.
+
+        A 404 usually means the persisted hash is stale, so the hash cache is
+        dropped before the account number is looked up again.
+        """
+        response = send(account_hash)
+        if response.status_code != 404:
+            return response
+        known = self._account_hashes or {}
+        number = next((num for num, value in known.items() if value == account_hash), None)
+        self.forget_account_hashes()
+        fresh_hash = self.get_account_hash(number) if number is not None else None
+        if fresh_hash is None or fresh_hash == account_hash:
+            return response
+        return send(fresh_hash)
+
+    def _map_accounts(
+        self,
+        fetch: Callable[[str], list[JsonObject]],
+        account_numbers: Iterable[str] | None = None,
+        failures: dict[str, str] | None = None,
+    ) -> dict[str, list[JsonObject]]:
+        """Call ``fetch(account_hash)`` for every account in parallel, keyed by number.
+
+        ``account_numbers`` limits the fan-out to those linked accounts. When a
+        ``failures`` dict is passed, an account whose request fails is recorded
+        there (number -> error) and left out of the result instead of raising.
+        """
+        if account_numbers is None:
+            hashes = self._known_hashes()
+        else:
+            numbers = list(account_numbers)
+            known = self._hashes_for(numbers)
+            missing = [number for number in numbers if number not in known]
+            if missing:
+                logger.warning("Skipping accounts not linked to this login: %s", missing)
+            hashes = {number: known[number] for number in numbers if number in known}
+        if not hashes:
+            return {}
+
+        def fetch_account(number: str, account_hash: str) -> list[JsonObject] | None:
+            try:
+                return fetch(account_hash)
+            except httpx.HTTPStatusError as exc:
+                if failures is None:
+                    raise
+                logger.warning(
+                    "Skipping account ...%s after a failed request: %s", number[-4:], exc
+                )
+                failures[number] = str(exc)
+                return None
+
+        workers = min(ACCOUNT_FANOUT_MAX_WORKERS, len(hashes))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(fetch_account, hashes.keys(), hashes.values())
+            return {
+                number: result
+                for number, result in zip(hashes, results, strict=True)
+                if result is not None
+            }
 
     @_retry_on_transient_error()
     def get_account(self, account_hash: str, include_positions: bool = True) -> JsonObject:
         """Get account details by hash value."""
         if include_positions:
-            response = self._client.get_account(
+            response = self._send_for_account(
                 account_hash,
-                fields=self._client.Account.Fields.POSITIONS,
+                lambda value: self._client.get_account(value, fields=self._positions_field),
             )
         else:
-            response = self._client.get_account(account_hash)
+            response = self._send_for_account(account_hash, self._client.get_account)
 
         response.raise_for_status()
-        return as_json_object(response.json())
+        return as_json_object(_decode_json(response))
+
+    def _fresh_snapshot(self, ttl: float = ACCOUNTS_CACHE_TTL_SECONDS) -> AccountsSnapshot | None:
+        snapshot = self._accounts_cache
+        return snapshot if snapshot is not None and snapshot.is_fresh(ttl) else None
+
+    def _cached_accounts(self) -> list[JsonObject] | None:
+        snapshot = self._fresh_snapshot()
+        return list(snapshot.accounts) if snapshot is not None else None
+
+    def _store_accounts(self, accounts: list[JsonObject]) -> AccountsSnapshot:
+        snapshot = self._accounts_cache = AccountsSnapshot(accounts)
+        return snapshot
+
+    def accounts_snapshot(
+        self, *, refresh: bool = False, ttl: float = ACCOUNTS_CACHE_TTL_SECONDS
+    ) -> AccountsSnapshot:
+        """Return the shared accounts snapshot, fetching a new one when stale or on ``refresh``.
+
+        Portfolio views are built from the snapshot, so a summary, positions,
+        balances, and allocation rendered together cost one request.
+        """
+        snapshot = None if refresh else self._fresh_snapshot(ttl)
+        if snapshot is None:
+            snapshot = self._store_accounts(self._fetch_all_accounts_full())
+        return snapshot
+
+    def _build_view(self, build: Callable[[Iterable[JsonObject]], JsonValue]) -> JsonValue:
+        # Views are rebuilt per call: aggregation costs about as much as copying a
+        # memoized view, and every caller gets a result it is free to mutate.
+        snapshot = self._fresh_snapshot()
+        if snapshot is None and not self._stream_accounts:
+            snapshot = self.accounts_snapshot()
+        if snapshot is None:
+            return build(self.iter_accounts_streaming())
+        return build(snapshot.accounts)
+
+    def invalidate_cache(self) -> None:
+        """Drop the cached accounts payload so the next read refetches it."""
+        self._accounts_cache = None
 
     @_retry_on_transient_error()
-    def get_all_accounts_full(self) -> list[JsonObject]:
-        """Get all accounts with positions."""
-        response = self._client.get_accounts(fields=self._client.Account.Fields.POSITIONS)
+    def _fetch_all_accounts_full(self) -> list[JsonObject]:
+        response = self._client.get_accounts(fields=self._positions_field)
         response.raise_for_status()
-        payload = as_json_array(response.json())
+        payload = as_json_array(_decode_json(response))
         return [account for account in payload if isinstance(account, dict)]
 
+    def get_all_accounts_full(self, *, use_cache: bool = True) -> list[JsonObject]:
+        """Get all accounts with positions.
+
+        Results are reused for ``ACCOUNTS_CACHE_TTL_SECONDS`` so several portfolio
+        views rendered together cost a single API round-trip.
+        """
+        if use_cache:
+            cached = self._cached_accounts()
+            if cached is not None:
+                return cached
+        accounts = self._fetch_all_accounts_full()
+        self._store_accounts(accounts)
+        return list(accounts)
+
+    @_retry_on_transient_error()
+    def _open_accounts_stream(self) -> tuple[ExitStack, StreamingResponse]:
+        # schwab-py has no streaming variant of get_accounts(), so mirror its
+        # request here; only the status check is retried, before any item is read.
+        fields = self._positions_field
+        stack = ExitStack()
+        response = stack.enter_context(
+            self._client.session.stream(
+                "GET", ACCOUNTS_URL, params={"fields": getattr(fields, "value", fields)}
+            )
+        )
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError:
+            stack.close()
+            raise
+        return stack, response
+
+    def iter_accounts_streaming(self) -> Iterator[JsonObject]:
+        """Yield accounts with positions one at a time as the response body arrives.
+
+        Requires the optional ``ijson`` package; without it this falls back to
+        :meth:`get_all_accounts_full` and yields from the fully decoded list. A
+        fresh cached payload is served without a request, and a fully consumed
+        stream refreshes the cache. Portfolio views only use this path when the
+        wrapper was created with ``stream_accounts=True``.
+        """
+        cached = self._cached_accounts()
+        if cached is not None:
+            yield from cached
+            return
+        if not IJSON_AVAILABLE:
+            yield from self.get_all_accounts_full()
+            return
+
+        accounts: list[JsonObject] = []
+        stack, response = self._open_accounts_stream()
+        with stack:
+            for account in _iter_json_array_items(response.iter_bytes()):
+                accounts.append(account)
+                yield account
+        self._store_accounts(accounts)
+
     def get_portfolio_summary(self) -> JsonObject:
         """Get comprehensive portfolio summary with cash/invested breakdown."""
-        accounts = self.get_all_accounts_full()
-        return build_portfolio_summary(
-            accounts,
-            self._get_account_display_name,
-            MONEY_MARKET_SYMBOLS,
+        return self._build_view(
+            lambda accounts: build_portfolio_summary(
+                accounts, self._get_account_display_name, MONEY_MARKET_SYMBOLS
+            )
         )
 
     def get_positions(self, symbol: str | None = None) -> list[JsonObject]:
         """Get detailed positions across all accounts."""
-        accounts = self.get_all_accounts_full()
-        return build_positions(accounts, self._get_account_display_name, symbol)
+        return self._build_view(
+            lambda accounts: build_positions(accounts, self._get_account_display_name, symbol)
+        )
 
     def get_account_balances(self) -> list[JsonObject]:
         """Get balances for all accounts."""
-        accounts = self.get_all_accounts_full()
-        return build_account_balances(
-            accounts,
-            self._get_account_display_name,
-            MONEY_MARKET_SYMBOLS,
+        return self._build_view(
+            lambda accounts: build_account_balances(
+                accounts, self._get_account_display_name, MONEY_MARKET_SYMBOLS
+            )
         )
 
     def analyze_allocation(self) -> JsonObject:
         """Analyze portfolio allocation and concentration."""
-        accounts = self.get_all_accounts_full()
-        return analyze_allocation(accounts)
+        return self._build_view(analyze_allocation)
+
+    def portfolio_snapshot(self) -> JsonObject:
+        """Build summary, positions, balances, and allocation from one accounts fetch."""
+        self.accounts_snapshot()
+        return {
+            "summary": self.get_portfolio_summary(),
+            "positions": self.get_positions(),
+            "balances": self.get_account_balances(),
+            "allocation": self.analyze_allocation(),
+        }
+
+    def _fresh_quote(self, symbol: str) -> JsonValue | None:
+        cached = self._quote_cache.get(symbol)
+        if cached is None or time.monotonic() - cached[0] > QUOTE_CACHE_TTL_SECONDS:
+            return None
+        return cached[1]
+
+    def _store_quotes(self, quotes: JsonObject) -> None:
+        now = time.monotonic()
+        for symbol, quote in quotes.items():
+            self._quote_cache[symbol] = (now, quote)
+
+    def clear_quote_cache(self) -> None:
+        """Drop cached quotes so the next lookups hit the API."""
+        self._quote_cache.clear()
 
     @_retry_on_transient_error()
-    def get_quote(self, symbol: str) -> JsonObject:
-        """Get quote for a single symbol."""
+    def _fetch_quote(self, symbol: str) -> JsonObject:
         response = self._client.get_quote(symbol)
         response.raise_for_status()
-        return as_json_object(response.json())
+        quotes = as_json_object(_decode_json(response))
+        if symbol in quotes:
+            self._store_quotes(quotes)
+        return quotes
+
+    def get_quote(self, symbol: str) -> JsonObject:
+        """Get quote for a single symbol.
+
+        Quotes are reused for ``QUOTE_CACHE_TTL_SECONDS``, and concurrent callers
+        asking for the same symbol share one in-flight request.
+        """
+        cached = self._fresh_quote(symbol)
+        if cached is not None:
+            return {symbol: cached}
+
+        with self._quote_lock:
+            pending = self._quote_inflight.get(symbol)
+            if pending is None:
+                done = self._quote_inflight[symbol] = threading.Event()
+
+        if pending is not None:
+            pending.wait()
+            cached = self._fresh_quote(symbol)
+            return {symbol: cached} if cached is not None else self._fetch_quote(symbol)
+
+        try:
+            return self._fetch_quote(symbol)
+        finally:
+            with self._quote_lock:
+                del self._quote_inflight[symbol]
+            done.set()
 
     @_retry_on_transient_error()
-    def get_quotes(self, symbols: list[str]) -> JsonObject:
-        """Get quotes for multiple symbols."""
+    def _fetch_quotes(self, symbols: list[str]) -> JsonObject:
         response = self._client.get_quotes(symbols)
         response.raise_for_status()
-        return as_json_object(response.json())
+        quotes = as_json_object(_decode_json(response))
+        self._store_quotes(quotes)
+        return quotes
+
+    def get_quotes(self, symbols: list[str]) -> JsonObject:
+        """Get quotes for multiple symbols, requesting only those not cached."""
+        quotes: JsonObject = {}
+        missing: list[str] = []
+        for symbol in symbols:
+            cached = self._fresh_quote(symbol)
+            if cached is None:
+                missing.append(symbol)
+            else:
+                quotes[symbol] = cached
+        if missing:
+            quotes.update(self._fetch_quotes(missing))
+        return quotes
+
+    def get_quotes_batched(
+        self,
+        symbols: list[str],
+        chunk_size: int = QUOTE_BATCH_SIZE,
+        max_workers: int = QUOTE_BATCH_MAX_WORKERS,
+    ) -> JsonObject:
+        """Get quotes for a long symbol list, fetching chunks in parallel.
+
+        Concurrency is capped by ``max_workers`` to stay clear of Schwab rate limits.
+        """
+        chunks = [symbols[i : i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+        if len(chunks) <= 1:
+            return self.get_quotes(symbols) if symbols else {}
+
+        quotes: JsonObject = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            for chunk_quotes in executor.map(self.get_quotes, chunks):
+                quotes.update(chunk_quotes)
+        return quotes
 
     @_retry_on_transient_error()
     def get_orders(self, account_hash: str) -> list[JsonObject]:
         """Get orders for an account."""
-        response = self._client.get_orders_for_account(account_hash)
+        response = self._send_for_account(account_hash, self._client.get_orders_for_account)
         response.raise_for_status()
-        payload = as_json_array(response.json())
+        payload = as_json_array(_decode_json(response))
         return [order for order in payload if isinstance(order, dict)]
 
+    def get_orders_all_accounts(self) -> dict[str, list[JsonObject]]:
+        """Get orders for every account, fetched in parallel and keyed by account number."""
+        return self._map_accounts(self.get_orders)
+
     def get_order(self, account_hash: str, order_id: int) -> JsonObject | None:
         """Get a specific order by ID."""
         response = self._client.get_order(order_id, account_hash)
         if response.status_code == 200:
-            return as_json_object(response.json())
+            return as_json_object(_decode_json(response))
         return None
 
+    def _transaction_type(self, name: str) -> TransactionTypeMember:
+        types = self._txn_type_map
+        if types is None:
+            types = {member.name: member for member in self._client.Transactions.TransactionType}
+            self._txn_type_map = types
+        member = types.get(name)
+        if member is None:
+            raise ValueError(f"Unknown transaction type: {name}")
+        return member
+
     @_retry_on_transient_error()
     def get_transactions(
         self,
@@ -140,18 +528,55 @@ class PortfolioClientMixin:
         end_dt = datetime.fromisoformat(end_date) if end_date else datetime.now()
         start_dt = datetime.fromisoformat(start_date) if start_date else end_dt - timedelta(days=30)
 
-        response = self._client.get_transactions(
+        transaction_types = self._transaction_type(transaction_type)
+        response = self._send_for_account(
             account_hash,
-            start_date=start_dt,
-            end_date=end_dt,
-            transaction_types=self._client.Transactions.TransactionType(transaction_type),
+            lambda value: self._client.get_transactions(
+                value,
+                start_date=start_dt,
+                end_date=end_dt,
+                transaction_types=transaction_types,
+            ),
         )
         response.raise_for_status()
-        payload = as_json_array(response.json())
+        payload = as_json_array(_decode_json(response))
         return [transaction for transaction in payload if isinstance(transaction, dict)]
 
+    def get_transactions_all_accounts(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        transaction_type: str = "TRADE",
+        *,
+        account_numbers: Iterable[str] | None = None,
+        failures: dict[str, str] | None = None,
+    ) -> dict[str, list[JsonObject]]:
+        """Get transactions for every account, fetched in parallel and keyed by account number.
+
+        Pass ``account_numbers`` to fetch only those accounts, and a ``failures``
+        dict to collect per-account errors instead of raising on the first one.
+        """
+        self._transaction_type(transaction_type)
+        return self._map_accounts(
+            lambda account_hash: self.get_transactions(
+                account_hash,
+                start_date=start_date,
+                end_date=end_date,
+                transaction_type=transaction_type,
+            ),
+            account_numbers,
+            failures,
+        )
+
     def _get_account_display_name(self, account_number: str) -> str:
-        """Get friendly display name for account."""
-        from src.schwab_client.snapshot import get_account_display_name
+        """Get friendly display name for account, memoized per account number."""
+        name = self._display_names.get(account_number)
+        if name is None:
+            from src.schwab_client.snapshot import get_account_display_name
+
+            name = self._display_names[account_number] = get_account_display_name(account_number)
+        return name
 
-        return get_account_display_name(account_number)
+    def invalidate_display_names(self) -> None:
+        """Forget memoized account display names (e.g. after the account config reloads)."""
+        self._display_names.clear()
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
 from typing import Protocol
 
 from src.core.json_types import JsonObject, JsonValue
@@ -17,6 +19,20 @@ class SchwabResponse(Protocol):
     def json(self) -> JsonValue: ...
 
 
+class StreamingResponse(Protocol):
+    def raise_for_status(self) -> None: ...
+
+    def iter_bytes(self) -> Iterator[bytes]: ...
+
+
+class StreamingSession(Protocol):
+    def stream(
+        self, method: str, url: str, **kwargs: object
+    ) -> AbstractContextManager[StreamingResponse]: ...
+
+    def close(self) -> None: ...
+
+
 class AccountFields(Protocol):
     POSITIONS: str
 
@@ -25,11 +41,18 @@ class AccountNamespace(Protocol):
     Fields: AccountFields
 
 
+class TransactionTypeMember(Protocol):
+    @property
+    def name(self) -> str: ...
+
+
 class TransactionTypeNamespace(Protocol):
     DIVIDEND_OR_INTEREST: object
 
     def __call__(self, value: str) -> object: ...
 
+    def __iter__(self) -> Iterator[TransactionTypeMember]: ...
+
 
 class TransactionsNamespace(Protocol):
     TransactionType: TransactionTypeNamespace
@@ -38,6 +61,7 @@ class TransactionsNamespace(Protocol):
 class SchwabClientTransport(Protocol):
     Account: AccountNamespace
     Transactions: TransactionsNamespace
+    session: StreamingSession
 
     def get_account_numbers(self) -> SchwabResponse: ...
 
@@ -66,3 +90,17 @@ class SchwabClientTransport(Protocol):
     def place_order(self, account_hash: str, order: JsonObject) -> SchwabResponse: ...
 
     def cancel_order(self, order_id: str, account_hash: str) -> SchwabResponse: ...
+
+
+class AccountHashResolver(Protocol):
+    """Account-hash and accounts-cache members the trading mixin needs from its host."""
+
+    __slots__ = ()
+
+    def get_account_hash(self, account_number: str) -> str | None: ...
+
+    def invalidate_cache(self) -> None: ...
+
+    def forget_account_hashes(self) -> None: ...
+
+    def _known_hashes(self) -> dict[str, str]: ...
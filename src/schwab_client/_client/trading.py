@@ -2,18 +2,24 @@
 
 from __future__ import annotations
 
-from functools import cache
+import threading
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from functools import cache, lru_cache
 from typing import Literal
 
+from src.core.errors import ConfigError
 from src.core.json_types import JsonObject
 from src.schwab_client.auth_tokens import suppress_authlib_jose_warning
 
-from .common import logger
-from .protocols import SchwabClientTransport
+from .common import ORDER_STATUS_POLL_SCHEDULE, _decode_json, logger
+from .protocols import AccountHashResolver, SchwabClientTransport
 
 
 @cache
 def _equity_order_builders():
+    """Map ``(action, order_type)`` to the matching schwab-py equity order builder."""
     with suppress_authlib_jose_warning():
         from schwab.orders.equities import (
             equity_buy_limit,
@@ -22,31 +28,129 @@ def _equity_order_builders():
             equity_sell_market,
         )
     return {
-        "buy_limit": equity_buy_limit,
-        "buy_market": equity_buy_market,
-        "sell_limit": equity_sell_limit,
-        "sell_market": equity_sell_market,
+        ("BUY", "MARKET"): equity_buy_market,
+        ("SELL", "MARKET"): equity_sell_market,
+        ("BUY", "LIMIT"): equity_buy_limit,
+        ("SELL", "LIMIT"): equity_sell_limit,
     }
 
 
-class TradingClientMixin:
+_CENT = Decimal("0.01")
+_SUB_DOLLAR_TICK = Decimal("0.0001")
+# Largest gap between a float and its tick that is treated as representation noise.
+_FLOAT_NOISE = Decimal("1e-9")
+
+
+@lru_cache(maxsize=1024)
+def _format_price(price: Decimal | float) -> str:
+    """Format an order price on Schwab's tick grid (cents, or 1/100 cent below $1).
+
+    Goes through ``Decimal(str(price))`` so float noise such as
+    ``100.10000000000001`` never reaches the order payload. Prices that are
+    genuinely off the grid are rejected rather than rounded, so an order is never
+    sent at a price the user did not ask for.
+    """
+    value = price if isinstance(price, Decimal) else Decimal(str(price))
+    tick = _SUB_DOLLAR_TICK if 0 < abs(value) < 1 else _CENT
+    on_grid = value.quantize(tick)
+    if abs(on_grid - value) > _FLOAT_NOISE:
+        raise ConfigError(
+            f"Price {value} is not a valid tick; use increments of ${tick} at this price."
+        )
+    return format(on_grid, "f")
+
+
+def _format_optional_price(price: Decimal | float | None) -> str:
+    return "None" if price is None else _format_price(price)
+
+
+# Price fields for order types schwab-py has no equity builder for, keyed by order type and
+# built from (limit_price, stop_price, trailing_stop_percent).
+type _PriceFields = Callable[[float | None, float | None, float | None], JsonObject]
+
+_MANUAL_ORDER_FIELDS: dict[str, _PriceFields] = {
+    "STOP": lambda limit, stop, trailing: {"stopPrice": _format_optional_price(stop)},
+    "STOP_LIMIT": lambda limit, stop, trailing: {
+        "stopPrice": _format_optional_price(stop),
+        "price": _format_optional_price(limit),
+    },
+    "TRAILING_STOP": lambda limit, stop, trailing: {
+        "stopPriceLinkBasis": "MARK",
+        "stopPriceLinkType": "PERCENT",
+        "stopPriceOffset": str(trailing),
+    },
+}
+
+# Order statuses that settle the post-placement check; anything else is re-polled.
+_ACCEPTED_ORDER_STATUSES = frozenset(
+    {"FILLED", "WORKING", "PENDING_ACTIVATION", "QUEUED", "ACCEPTED"}
+)
+_FAILED_ORDER_STATUSES = frozenset({"REJECTED", "CANCELED", "EXPIRED"})
+
+
+def _order_status_result(order_id: str, order_data: JsonObject) -> JsonObject | None:
+    """Interpret a fetched order, returning a result once its status is terminal."""
+    status = order_data.get("status", "UNKNOWN")
+
+    if status in _FAILED_ORDER_STATUSES:
+        status_description = order_data.get("statusDescription", "Unknown reason")
+        return {
+            "success": False,
+            "order_id": order_id,
+            "status": status,
+            "error": f"Order {status.lower()}: {status_description}",
+            "status_description": status_description,
+            "status_code": 201,
+        }
+    if status in _ACCEPTED_ORDER_STATUSES:
+        return {
+            "success": True,
+            "order_id": order_id,
+            "status": status,
+            "status_code": 201,
+        }
+    return None
+
+
+class TradingClientMixin(AccountHashResolver):
     """Mixin providing order placement and cancellation helpers."""
 
+    __slots__ = ()
+
     _client: SchwabClientTransport
+    _trade_accounts: dict[str, JsonObject]
+    _order_status: dict[str, JsonObject]
 
-    def get_account_hash(self, account_number: str) -> str | None:
-        raise NotImplementedError
+    def place_order(
+        self,
+        account_hash: str,
+        order: JsonObject,
+        *,
+        await_status: bool = True,
+        poll_schedule: tuple[float, ...] = ORDER_STATUS_POLL_SCHEDULE,
+    ) -> JsonObject:
+        """Place an order for an account.
 
-    def place_order(self, account_hash: str, order: JsonObject) -> JsonObject:
-        """Place an order for an account."""
+        With ``await_status=False`` the 201 is returned immediately and the status
+        check runs on a background thread; read it later with
+        :meth:`get_known_order_status`.
+        """
         response = self._client.place_order(account_hash, order)
 
         if response.status_code == 201:
-            location = response.headers.get("Location", "")
-            order_id = location.split("/")[-1] if location else None
-
-            if order_id:
-                order_status = self._check_order_status(account_hash, order_id)
+            self.invalidate_cache()
+            location = response.headers.get("Location")
+            order_id = location.rpartition("/")[2] if location else None
+
+            if order_id and not await_status:
+                threading.Thread(
+                    target=self._check_order_status,
+                    args=(account_hash, order_id, poll_schedule),
+                    name=f"order-status-{order_id}",
+                    daemon=True,
+                ).start()
+            elif order_id:
+                order_status = self._check_order_status(account_hash, order_id, poll_schedule)
                 if order_status:
                     return order_status
 
@@ -56,44 +160,81 @@ class TradingClientMixin:
                 "status_code": response.status_code,
             }
 
+        if response.status_code == 404:
+            # A stale persisted hash; re-resolve on the next order instead of retrying this one.
+            self.forget_account_hashes()
+            self._trade_accounts.clear()
+
         return {
             "success": False,
             "error": response.text,
             "status_code": response.status_code,
         }
 
-    def _check_order_status(self, account_hash: str, order_id: str) -> JsonObject | None:
-        """Check whether an accepted order was later rejected asynchronously."""
-        try:
-            response = self._client.get_order(int(order_id), account_hash)
-            if response.status_code == 200:
-                order_data = response.json()
-                status = order_data.get("status", "UNKNOWN")
-
-                if status == "REJECTED":
-                    status_description = order_data.get("statusDescription", "Unknown reason")
-                    return {
-                        "success": False,
-                        "order_id": order_id,
-                        "status": "REJECTED",
-                        "error": f"Order rejected: {status_description}",
-                        "status_description": status_description,
-                        "status_code": 201,
-                    }
-                if status in {"FILLED", "WORKING", "PENDING_ACTIVATION", "QUEUED", "ACCEPTED"}:
-                    return {
-                        "success": True,
-                        "order_id": order_id,
-                        "status": status,
-                        "status_code": 201,
-                    }
-            return None
-        except (AttributeError, OSError, TypeError, ValueError) as exc:  # pragma: no cover - defensive logging path
-            logger.warning("Could not verify order status: %s", exc)
-            return None
+    def _check_order_status(
+        self,
+        account_hash: str,
+        order_id: str,
+        poll_schedule: tuple[float, ...] = ORDER_STATUS_POLL_SCHEDULE,
+    ) -> JsonObject | None:
+        """Check whether an accepted order was later rejected asynchronously.
+
+        Orders that Schwab reports with a not-yet-settled status are re-checked
+        after each delay in ``poll_schedule`` instead of being reported as unknown.
+        """
+        delays = iter(poll_schedule)
+        while True:
+            try:
+                response = self._client.get_order(int(order_id), account_hash)
+                if response.status_code != 200:
+                    return None
+                result = _order_status_result(order_id, _decode_json(response))
+            except (AttributeError, OSError, TypeError, ValueError) as exc:  # pragma: no cover
+                logger.warning("Could not verify order status: %s", exc)
+                return None
+            if result is not None:
+                self._order_status[order_id] = result
+                return result
+            delay = next(delays, None)
+            if delay is None:
+                return None
+            time.sleep(delay)
+
+    def get_known_order_status(self, order_id: str) -> JsonObject | None:
+        """Return the last status recorded for an order placed by this wrapper."""
+        return self._order_status.get(order_id)
+
+    def warmup(self) -> int:
+        """Pre-resolve every configured account alias for trading.
+
+        Fetches the account hashes once and fills the per-alias trade cache, so
+        a batch of orders (e.g. a rebalance) does no config or hash lookups.
+        Returns the number of aliases resolved.
+        """
+        from src.schwab_client.client import secure_config
+
+        hashes = self._known_hashes()
+        for alias, info in secure_config.get_all_accounts().items():
+            account_hash = hashes.get(info.account_number)
+            if account_hash:
+                self._trade_accounts[alias] = {
+                    "success": True,
+                    "account_hash": account_hash,
+                    "account_number": info.account_number,
+                    "account_label": info.label,
+                }
+        return len(self._trade_accounts)
 
     def _resolve_account_for_trade(self, account_alias: str) -> JsonObject:
-        """Resolve account alias to account details used by order methods."""
+        """Resolve account alias to account details used by order methods.
+
+        Successful resolutions are cached per wrapper so batches of orders against
+        the same alias skip the config and account-hash lookups.
+        """
+        cached = self._trade_accounts.get(account_alias)
+        if cached is not None:
+            return cached
+
         from src.schwab_client.client import secure_config
 
         account_number = secure_config.get_account_number(account_alias)
@@ -105,12 +246,14 @@ class TradingClientMixin:
             return {"success": False, "error": f"Could not get hash for account: {account_alias}"}
 
         account_info = secure_config.get_account_info(account_alias)
-        return {
+        resolved: JsonObject = {
             "success": True,
             "account_hash": account_hash,
             "account_number": account_number,
             "account_label": account_info.label if account_info else account_alias,
         }
+        self._trade_accounts[account_alias] = resolved
+        return resolved
 
     def _build_equity_order(
         self,
@@ -125,16 +268,16 @@ class TradingClientMixin:
     ) -> JsonObject:
         """Build an equity order payload."""
         symbol_upper = symbol.upper()
-        instruction = "BUY" if action == "BUY" else "SELL"
 
-        builders = _equity_order_builders()
-        if order_type == "MARKET":
-            key = "buy_market" if action == "BUY" else "sell_market"
-            return builders[key](symbol_upper, quantity).build()
+        builder = _equity_order_builders().get((action, order_type))
+        if builder is not None:
+            if order_type == "MARKET":
+                return builder(symbol_upper, quantity).build()
+            return builder(symbol_upper, quantity, _format_optional_price(limit_price)).build()
 
-        if order_type == "LIMIT":
-            key = "buy_limit" if action == "BUY" else "sell_limit"
-            return builders[key](symbol_upper, quantity, str(limit_price)).build()
+        price_fields = _MANUAL_ORDER_FIELDS.get(order_type)
+        if price_fields is None:
+            raise ValueError(f"Unsupported order type: {order_type}")
 
         order: JsonObject = {
             "orderStrategyType": "SINGLE",
@@ -142,7 +285,7 @@ class TradingClientMixin:
             "duration": "GOOD_TILL_CANCEL",
             "orderLegCollection": [
                 {
-                    "instruction": instruction,
+                    "instruction": action,
                     "quantity": quantity,
                     "instrument": {
                         "symbol": symbol_upper,
@@ -150,21 +293,9 @@ class TradingClientMixin:
                     },
                 }
             ],
+            "orderType": order_type,
         }
-
-        if order_type == "STOP":
-            order["orderType"] = "STOP"
-            order["stopPrice"] = str(stop_price)
-        elif order_type == "STOP_LIMIT":
-            order["orderType"] = "STOP_LIMIT"
-            order["stopPrice"] = str(stop_price)
-            order["price"] = str(limit_price)
-        elif order_type == "TRAILING_STOP":
-            order["orderType"] = "TRAILING_STOP"
-            order["stopPriceLinkBasis"] = "MARK"
-            order["stopPriceLinkType"] = "PERCENT"
-            order["stopPriceOffset"] = str(trailing_stop_percent)
-
+        order.update(price_fields(limit_price, stop_price, trailing_stop_percent))
         return order
 
     def _submit_equity_order(
@@ -207,10 +338,11 @@ class TradingClientMixin:
                 "account_number_masked": f"...{account['account_number'][-4:]}",
                 "order": order,
             }
+            # Show the exact price strings that go into the order payload.
             if limit_price is not None:
-                preview["limit_price"] = limit_price
+                preview["limit_price"] = _format_price(limit_price)
             if stop_price is not None:
-                preview["stop_price"] = stop_price
+                preview["stop_price"] = _format_price(stop_price)
             if trailing_stop_percent is not None:
                 preview["trailing_stop_percent"] = trailing_stop_percent
             return preview
@@ -356,6 +488,7 @@ class TradingClientMixin:
 
         response = self._client.cancel_order(order_id, account["account_hash"])
         if response.status_code == 200:
+            self.invalidate_cache()
             return {"success": True, "order_id": order_id, "status": "cancelled"}
         return {
             "success": False,
@@ -10,16 +10,14 @@ import logging
 import os
 from pathlib import Path
 
-from dotenv import load_dotenv
-
 from src.core.errors import ConfigError
 from src.schwab_client.auth_tokens import (
     AUTH_PROBE_ERRORS,
     AUTH_RECOVERY_ERRORS,
-    DEFAULT_TOKEN_PATH,
     TOKEN_MAX_AGE_SECONDS,
     TokenManager,
     get_token_manager,
+    load_env_once,
     oauth_error_type,
     resolve_data_dir,
     resolve_token_db_path,
@@ -28,13 +26,13 @@ from src.schwab_client.auth_tokens import (
 )
 from src.schwab_client.secure_files import ensure_sensitive_dir
 
-load_dotenv()
+load_env_once()
 logger = logging.getLogger(__name__)
 
 __all__ = [
     "AUTH_PROBE_ERRORS",
     "AUTH_RECOVERY_ERRORS",
-    "DEFAULT_TOKEN_PATH",
+    "DEFAULT_TOKEN_PATH",  # noqa: F822 - resolved lazily by __getattr__
     "TOKEN_MAX_AGE_SECONDS",
     "TokenManager",
     "authenticate_interactive",
@@ -50,6 +48,12 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str) -> Path:
+    if name == "DEFAULT_TOKEN_PATH":
+        return resolve_token_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def resolve_portfolio_callback_url() -> str:
     return os.getenv("SCHWAB_INTEL_CALLBACK_URL", "https://127.0.0.1:8001")
 
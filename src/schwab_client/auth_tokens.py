@@ -26,7 +26,14 @@ from src.schwab_client.secure_files import (
     write_sensitive_json,
 )
 
-load_dotenv()
+
+@cache
+def load_env_once() -> None:
+    """Load ``.env`` into the process environment; later calls are no-ops."""
+    load_dotenv()
+
+
+load_env_once()
 logger = logging.getLogger(__name__)
 
 DATA_DIR_ENV = "SCHWAB_CLI_DATA_DIR"
@@ -73,7 +80,11 @@ def oauth_error_type() -> type[Exception]:
 
 
 def resolve_data_dir() -> Path:
-    """Resolve the base data directory."""
+    """Resolve the base data directory.
+
+    Env vars (including ``HOME``) are read on every call so overrides apply
+    immediately.
+    """
     env_dir = os.getenv(DATA_DIR_ENV)
     if env_dir:
         return Path(env_dir).expanduser()
@@ -98,8 +109,11 @@ def resolve_token_db_path(token_path: str | Path | None = None) -> Path:
     return Path(token_path).expanduser().parent / TOKEN_DB_FILENAME
 
 
-# Default token locations
-DEFAULT_TOKEN_PATH = resolve_token_path()
+def __getattr__(name: str) -> Path:
+    # DEFAULT_TOKEN_PATH is resolved on access so importing this module does no path work.
+    if name == "DEFAULT_TOKEN_PATH":
+        return resolve_token_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _parse_datetime_like(value: object) -> datetime | None:
@@ -262,11 +276,11 @@ class TokenManager:
 
     def load_tokens(self) -> JsonObject | None:
         """Load tokens from the token JSON file."""
-        if not self.tokens_exist():
-            return None
         try:
             with self.token_path.open() as f:
                 return json.load(f)
+        except FileNotFoundError:
+            return None
         except (OSError, json.JSONDecodeError) as exc:
             logger.error("Failed to load tokens from %s: %s", self.token_path, exc)
             return None
@@ -283,7 +297,10 @@ class TokenManager:
         window = _derive_token_window(tokens)
         created_at = window[0].isoformat() if window else None
         expires_at = window[1].isoformat() if window else None
-        file_mtime = self.token_path.stat().st_mtime if self.token_path.exists() else None
+        try:
+            file_mtime: float | None = self.token_path.stat().st_mtime
+        except FileNotFoundError:
+            file_mtime = None
         target = conn or self._connect()
         try:
             target.execute(
@@ -415,8 +432,11 @@ class TokenManager:
     def delete_tokens(self) -> None:
         """Delete the token file and its cached state."""
         with self.auth_lock() as conn:
-            if self.token_path.exists():
+            try:
                 self.token_path.unlink()
+            except FileNotFoundError:
+                pass
+            else:
                 logger.info("Deleted token file: %s", self.token_path)
             self._delete_state(conn=conn)
 
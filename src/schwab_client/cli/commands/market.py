@@ -398,36 +398,31 @@ def cmd_dividends(
             return
 
         # Historical dividends
-        raw_client = client.raw_client
-        TransactionType = raw_client.Transactions.TransactionType
-
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
 
-        all_dividends = []
-        for alias in secure_config.get_all_accounts():
-            account_number = secure_config.get_account_number(alias)
-            if not account_number:
-                continue
-            account_hash = client.get_account_hash(account_number)
-            if not account_hash:
-                continue
-
-            resp = raw_client.get_transactions(
-                account_hash,
-                start_date=start_date,
-                end_date=end_date,
-                transaction_types=[TransactionType.DIVIDEND_OR_INTEREST],
-            )
-            transactions = resp.json() if hasattr(resp, "json") else resp
-            if isinstance(transactions, list):
-                all_dividends.extend(
-                    [
-                        t
-                        for t in transactions
-                        if t.get("transactionType") in ["DIVIDEND", "INTEREST"]
-                    ]
-                )
+        configured_numbers = {
+            account_number
+            for alias in secure_config.get_all_accounts()
+            if (account_number := secure_config.get_account_number(alias))
+        }
+        # A failing account is skipped and reported rather than aborting the command.
+        failures: dict[str, str] = {}
+        transactions_by_account = client.get_transactions_all_accounts(
+            start_date=start_date.isoformat(),
+            end_date=end_date.isoformat(),
+            transaction_type="DIVIDEND_OR_INTEREST",
+            account_numbers=configured_numbers,
+            failures=failures,
+        )
+        failed_accounts = [secure_config.mask_account_number(number) for number in failures]
+
+        all_dividends = [
+            t
+            for transactions in transactions_by_account.values()
+            for t in transactions
+            if t.get("transactionType") in ["DIVIDEND", "INTEREST"]
+        ]
 
         data = {
             "transactions": [
@@ -438,7 +433,8 @@ def cmd_dividends(
                     "amount": t.get("amount"),
                 }
                 for t in all_dividends
-            ]
+            ],
+            "failed_accounts": failed_accounts,
         }
 
         if output_mode == "json":
@@ -457,6 +453,8 @@ def cmd_dividends(
         else:
             print("  No dividends received.")
             print("\n  Use --upcoming to see ex-dates for your holdings")
+        if failed_accounts:
+            print(f"\n  Could not fetch transactions for: {', '.join(failed_accounts)}")
 
         print()
 
@@ -181,7 +181,7 @@ def require_trade_confirmation(
     symbol: str,
     quantity: float,
     account_label: str,
-    limit_price: float | None = None,
+    limit_price: str | None = None,
 ) -> bool:
     """Require user to type CONFIRM for live trades."""
     print(f"\n{'=' * 60}")
@@ -191,7 +191,7 @@ def require_trade_confirmation(
     print(f"Symbol:   {symbol}")
     print(f"Quantity: {quantity:g} shares")
     if limit_price:
-        print(f"Type:     LIMIT @ ${limit_price:.2f}")
+        print(f"Type:     LIMIT @ ${limit_price}")
     else:
         print("Type:     MARKET")
     print(f"Account:  {account_label}")
@@ -209,32 +209,37 @@ def require_trade_confirmation(
 
 
 def _format_order_type(
-    limit_price: float | None = None,
-    stop_price: float | None = None,
+    limit_price: str | None = None,
+    stop_price: str | None = None,
     trailing_stop_percent: float | None = None,
 ) -> str:
-    """Format order type string for display."""
+    """Format order type string for display from the order payload's price strings."""
     if trailing_stop_percent is not None:
         return f"TRAILING STOP @ {trailing_stop_percent}%"
     if stop_price is not None and limit_price is not None:
-        return f"STOP-LIMIT stop=${stop_price:.2f} limit=${limit_price:.2f}"
+        return f"STOP-LIMIT stop=${stop_price} limit=${limit_price}"
     if stop_price is not None:
-        return f"STOP @ ${stop_price:.2f}"
+        return f"STOP @ ${stop_price}"
     if limit_price is not None:
-        return f"LIMIT @ ${limit_price:.2f}"
+        return f"LIMIT @ ${limit_price}"
     return "MARKET"
 
 
 def format_order_preview(
     action: str,
     preview: dict,
-    limit_price: float | None,
     account_label: str,
     dry_run: bool = False,
-    stop_price: float | None = None,
-    trailing_stop_percent: float | None = None,
 ) -> str:
-    """Format order preview text."""
+    """Format order preview text.
+
+    Prices come from the preview itself, so the text matches what will be submitted.
+    """
+    order_type = _format_order_type(
+        preview.get("limit_price"),
+        preview.get("stop_price"),
+        preview.get("trailing_stop_percent"),
+    )
     header = "ORDER PREVIEW (DRY RUN)" if dry_run else "ORDER PREVIEW"
     lines = [
         f"\n{'=' * 60}",
@@ -243,7 +248,7 @@ def format_order_preview(
         f"Action:   {action}",
         f"Symbol:   {preview['symbol']}",
         f"Quantity: {preview['quantity']} shares",
-        f"Type:     {_format_order_type(limit_price, stop_price, trailing_stop_percent)}",
+        f"Type:     {order_type}",
     ]
     lines.append(f"Account:  {account_label}")
 
@@ -321,6 +326,8 @@ def execute_trade(
                 preview = client.sell_market(account, symbol, quantity, dry_run=True)
 
         account_label = f"{preview['account']} ({preview['account_number_masked']})"
+        # Exact limit price string from the order payload, for logs and confirmation.
+        submitted_limit = preview.get("limit_price")
 
         # Log attempt
         log_trade_attempt(
@@ -328,7 +335,7 @@ def execute_trade(
             symbol=symbol,
             quantity=quantity,
             account_alias=account,
-            limit_price=limit_price,
+            limit_price=submitted_limit,
             dry_run=dry_run,
         )
 
@@ -340,17 +347,7 @@ def execute_trade(
                     data={"preview": preview, "submitted": False, "dry_run": True},
                 )
             else:
-                print(
-                    format_order_preview(
-                        action_upper,
-                        preview,
-                        limit_price,
-                        account_label,
-                        dry_run=True,
-                        stop_price=stop_price,
-                        trailing_stop_percent=trailing_stop_percent,
-                    )
-                )
+                print(format_order_preview(action_upper, preview, account_label, dry_run=True))
             return
 
         # Enforce safety rules for live trades
@@ -363,16 +360,7 @@ def execute_trade(
         )
 
         # Show preview
-        print(
-            format_order_preview(
-                action_upper,
-                preview,
-                limit_price,
-                account_label,
-                stop_price=stop_price,
-                trailing_stop_percent=trailing_stop_percent,
-            )
-        )
+        print(format_order_preview(action_upper, preview, account_label))
 
         # Require explicit confirmation
         confirmed = require_trade_confirmation(
@@ -380,7 +368,7 @@ def execute_trade(
             symbol=symbol,
             quantity=quantity,
             account_label=account_label,
-            limit_price=limit_price,
+            limit_price=submitted_limit,
         )
 
         if not confirmed:
@@ -389,7 +377,7 @@ def execute_trade(
                 symbol=symbol,
                 quantity=quantity,
                 account_alias=account,
-                limit_price=limit_price,
+                limit_price=submitted_limit,
                 cancelled=True,
             )
             print("Order cancelled.")
@@ -419,7 +407,7 @@ def execute_trade(
                 symbol=symbol,
                 quantity=quantity,
                 account_alias=account,
-                limit_price=limit_price,
+                limit_price=submitted_limit,
                 executed=True,
             )
             print("\nOrder submitted successfully!")
@@ -434,7 +422,7 @@ def execute_trade(
                 symbol=symbol,
                 quantity=quantity,
                 account_alias=account,
-                limit_price=limit_price,
+                limit_price=submitted_limit,
                 error=error_msg,
             )
 
@@ -5,6 +5,7 @@ Provides lazy singletons for portfolio and market clients to avoid
 redundant token I/O on every command.
 """
 
+import atexit
 import logging
 import os
 from pathlib import Path
@@ -16,6 +17,7 @@ from ..auth import get_authenticated_client
 from ..auth_tokens import resolve_data_dir
 from ..client import SchwabClientWrapper
 from ..market_auth import get_market_client
+from ..paths import resolve_account_hash_cache_path
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +38,9 @@ def get_client() -> SchwabClientWrapper:
     global _portfolio_client
     if _portfolio_client is None:
         raw_client = get_authenticated_client()
-        _portfolio_client = SchwabClientWrapper(raw_client)
+        _portfolio_client = SchwabClientWrapper(
+            raw_client, hash_cache_path=resolve_account_hash_cache_path()
+        )
     return _portfolio_client
 
 
@@ -57,6 +61,24 @@ def get_cached_market_client():
     return _market_client
 
 
+def close_clients() -> None:
+    """Close cached clients' HTTP sessions and drop the singletons.
+
+    Each client keeps one pooled keep-alive session for the whole invocation,
+    so the TLS handshake is paid once; this releases those sockets at exit.
+    """
+    global _portfolio_client, _market_client
+    if _portfolio_client is not None:
+        _portfolio_client.close()
+        _portfolio_client = None
+    if _market_client is not None:
+        _market_client.session.close()
+        _market_client = None
+
+
+atexit.register(close_clients)
+
+
 def get_trade_logger() -> logging.Logger:
     """Get or create the trade audit logger (lazy singleton)."""
     global _trade_logger
@@ -94,7 +116,7 @@ def log_trade_attempt(
     symbol: str,
     quantity: float,
     account_alias: str,
-    limit_price: float | None = None,
+    limit_price: str | None = None,
     dry_run: bool = False,
     executed: bool = False,
     cancelled: bool = False,
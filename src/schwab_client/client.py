@@ -2,23 +2,69 @@
 
 from __future__ import annotations
 
+import threading
+from pathlib import Path
+from typing import Self
+
 from config.secure_account_config import secure_config
+from src.core.json_types import JsonObject, JsonValue
 
-from ._client import MONEY_MARKET_SYMBOLS, PortfolioClientMixin, TradingClientMixin
-from ._client.protocols import SchwabClientTransport
+from ._client import (
+    MONEY_MARKET_SYMBOLS,
+    AccountsSnapshot,
+    PortfolioClientMixin,
+    TradingClientMixin,
+)
+from ._client.protocols import SchwabClientTransport, TransactionTypeMember
 
 
 class SchwabClientWrapper(PortfolioClientMixin, TradingClientMixin):
     """Thin public wrapper around an authenticated ``schwab.Client`` instance."""
 
-    def __init__(self, client: SchwabClientTransport) -> None:
+    __slots__ = ("_client", "_order_status", "_positions_field", "_trade_accounts")
+
+    def __init__(
+        self,
+        client: SchwabClientTransport,
+        *,
+        hash_cache_path: Path | None = None,
+        stream_accounts: bool = False,
+    ) -> None:
+        """Wrap ``client``; pass ``hash_cache_path`` to persist account hashes across runs.
+
+        ``stream_accounts=True`` builds single portfolio views from the accounts
+        body as it streams in (requires ``ijson``) instead of one decoded fetch.
+        """
         self._client = client
         self._account_hashes: dict[str, str] | None = None
+        self._hash_cache_path = hash_cache_path
+        self._hash_lock = threading.Lock()
+        self._hashes_refreshed = False
+        self._accounts_cache: AccountsSnapshot | None = None
+        self._display_names: dict[str, str] = {}
+        self._quote_cache: dict[str, tuple[float, JsonValue]] = {}
+        self._quote_inflight: dict[str, threading.Event] = {}
+        self._quote_lock = threading.Lock()
+        self._positions_field = client.Account.Fields.POSITIONS
+        self._stream_accounts = stream_accounts
+        self._txn_type_map: dict[str, TransactionTypeMember] | None = None
+        self._trade_accounts: dict[str, JsonObject] = {}
+        self._order_status: dict[str, JsonObject] = {}
 
     @property
     def raw_client(self) -> SchwabClientTransport:
         """Access the underlying ``schwab-py`` client for advanced operations."""
         return self._client
 
+    def close(self) -> None:
+        """Close the pooled HTTP session shared by every request from this wrapper."""
+        self._client.session.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
 
 __all__ = ["MONEY_MARKET_SYMBOLS", "SchwabClientWrapper", "secure_config"]
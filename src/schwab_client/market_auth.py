@@ -13,8 +13,6 @@ import os
 import sys
 from pathlib import Path
 
-from dotenv import load_dotenv
-
 from src.core.errors import ConfigError
 from src.schwab_client.auth_tokens import (
     AUTH_PROBE_ERRORS,
@@ -22,22 +20,29 @@ from src.schwab_client.auth_tokens import (
     TOKEN_MAX_AGE_SECONDS,
     TokenManager,
     get_token_manager,
+    load_env_once,
     oauth_error_type,
     resolve_token_path,
     schwab_auth_module,
 )
 from src.schwab_client.secure_files import ensure_sensitive_dir
 
-load_dotenv()
+load_env_once()
 
 MARKET_TOKEN_PATH_ENV = "SCHWAB_MARKET_TOKEN_PATH"
 
 
+def _market_credentials() -> tuple[str | None, str | None]:
+    """Return the market data app key and secret from the environment."""
+    env = os.environ
+    return env.get("SCHWAB_MARKET_APP_KEY"), env.get("SCHWAB_MARKET_CLIENT_SECRET")
+
+
 def _market_uses_portfolio_oauth_app() -> bool:
-    portfolio_key = os.getenv("SCHWAB_INTEL_APP_KEY")
-    portfolio_secret = os.getenv("SCHWAB_INTEL_CLIENT_SECRET")
-    market_key = os.getenv("SCHWAB_MARKET_APP_KEY")
-    market_secret = os.getenv("SCHWAB_MARKET_CLIENT_SECRET")
+    env = os.environ
+    portfolio_key = env.get("SCHWAB_INTEL_APP_KEY")
+    portfolio_secret = env.get("SCHWAB_INTEL_CLIENT_SECRET")
+    market_key, market_secret = _market_credentials()
     return bool(
         portfolio_key
         and portfolio_secret
@@ -74,8 +79,7 @@ def verify_market_token_live() -> tuple[bool, str | None]:
 
     Returns (success, error_message).
     """
-    api_key = os.getenv("SCHWAB_MARKET_APP_KEY")
-    app_secret = os.getenv("SCHWAB_MARKET_CLIENT_SECRET")
+    api_key, app_secret = _market_credentials()
     if not api_key or not app_secret:
         return False, "credentials_missing"
 
@@ -138,8 +142,7 @@ def parse_args() -> argparse.Namespace:
 def authenticate_market_data(args: argparse.Namespace | None = None):
     """Run interactive authentication for Market Data API."""
     args = args or parse_args()
-    api_key = os.getenv("SCHWAB_MARKET_APP_KEY")
-    app_secret = os.getenv("SCHWAB_MARKET_CLIENT_SECRET")
+    api_key, app_secret = _market_credentials()
     callback_url = resolve_market_callback_url()
     token_path = resolve_market_token_path()
 
@@ -309,8 +312,7 @@ def get_market_client():
 
     Returns existing client if tokens valid, otherwise runs auth flow.
     """
-    api_key = os.getenv("SCHWAB_MARKET_APP_KEY")
-    app_secret = os.getenv("SCHWAB_MARKET_CLIENT_SECRET")
+    api_key, app_secret = _market_credentials()
     callback_url = resolve_market_callback_url()
     token_path = resolve_market_token_path()
 
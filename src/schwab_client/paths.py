@@ -6,11 +6,12 @@ import os
 from datetime import datetime
 from pathlib import Path
 
-from .auth_tokens import resolve_data_dir
+from .auth_tokens import resolve_data_dir, resolve_token_path
 
 HISTORY_DB_ENV_VAR = "SCHWAB_HISTORY_DB_PATH"
 REPORT_DIR_ENV_VAR = "SCHWAB_REPORT_DIR"
 MANUAL_ACCOUNTS_ENV_VAR = "SCHWAB_MANUAL_ACCOUNTS_PATH"
+ACCOUNT_HASHES_FILENAME = "account_hashes.json"
 
 
 def resolve_private_dir() -> Path | None:
@@ -83,6 +84,11 @@ def resolve_manual_accounts_path() -> Path | None:
     return None
 
 
+def resolve_account_hash_cache_path() -> Path:
+    """Resolve the cached account-number -> hash map stored beside the portfolio token."""
+    return resolve_token_path().parent / ACCOUNT_HASHES_FILENAME
+
+
 def default_history_import_roots() -> list[Path]:
     """Return default JSON import roots for history backfill."""
     paths: list[Path] = []
@@ -97,10 +103,12 @@ def default_history_import_roots() -> list[Path]:
 
 
 __all__ = [
+    "ACCOUNT_HASHES_FILENAME",
     "HISTORY_DB_ENV_VAR",
     "MANUAL_ACCOUNTS_ENV_VAR",
     "REPORT_DIR_ENV_VAR",
     "default_history_import_roots",
+    "resolve_account_hash_cache_path",
     "resolve_history_db_path",
     "resolve_manual_accounts_path",
     "resolve_private_dir",
@@ -21,8 +21,9 @@ def _chmod_best_effort(path: Path, mode: int) -> None:
 
 def ensure_sensitive_dir(path: Path) -> Path:
     """Create a directory intended for local secrets/private data."""
-    existed = path.exists()
-    path.mkdir(parents=True, exist_ok=True)
+    existed = path.is_dir()
+    if not existed:
+        path.mkdir(parents=True, exist_ok=True)
     if not existed or path.name in SENSITIVE_DIR_NAMES:
         _chmod_best_effort(path, SENSITIVE_DIR_MODE)
     for parent in path.parents:
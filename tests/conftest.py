@@ -1,12 +1,24 @@
 """Shared pytest fixtures for test suite"""
 
+import contextlib
+import io
 import json
-import subprocess
+import subprocess as _subprocess
 import sys
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 from typing import Any
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Command prefix and working directory for subprocess=True CLI runs
+_CLI_COMMAND: tuple[str, ...] = (sys.executable, "-m", "src.schwab_client.cli")
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+
 # JSON Schema for CLI response envelope
 ENVELOPE_SCHEMA: dict[str, Any] = {
     "type": "object",
@@ -21,9 +33,11 @@ ENVELOPE_SCHEMA: dict[str, Any] = {
     },
     "additionalProperties": False,
 }
+_ENVELOPE_REQUIRED: frozenset[str] = frozenset(ENVELOPE_SCHEMA["required"])
+_ENVELOPE_ALLOWED: frozenset[str] = frozenset(ENVELOPE_SCHEMA["properties"])
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CLIResult:
     """Result from running the CLI."""
 
@@ -43,41 +57,110 @@ class CLIResult:
         return self.json_data.get("data", {})
 
 
-def run_cli(*args: str, timeout: int = 30) -> CLIResult:
+def run_cli(*args: str, timeout: int = 30, subprocess: bool = False) -> CLIResult:
     """Run the schwab CLI with given arguments.
 
+    Runs ``main()`` in-process with stdout/stderr captured, which avoids an
+    interpreter start and package import per call.
+
     Args:
         *args: CLI arguments (e.g., "portfolio", "--json")
-        timeout: Command timeout in seconds
+        timeout: Command timeout in seconds (subprocess mode only)
+        subprocess: Spawn a separate interpreter for tests that need process isolation
 
     Returns:
         CLIResult with exit_code, stdout, stderr, and parsed json_data
     """
-    cmd = [sys.executable, "-m", "src.schwab_client.cli", *args]
-
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-        cwd=Path(__file__).parent.parent,
-    )
+    raw_stdout: str | bytes
+    if subprocess:
+        exit_code, raw_stdout, stderr = _run_cli_subprocess(args, timeout)
+    else:
+        exit_code, raw_stdout, stderr = _run_cli_in_process(args)
 
     json_data = None
     if "--json" in args:
         try:
-            json_data = json.loads(result.stdout)
+            json_data = json_loads(raw_stdout)
         except json.JSONDecodeError:
             pass
 
+    if isinstance(raw_stdout, bytes):
+        stdout = raw_stdout.decode("utf-8", "replace")
+    else:
+        stdout = raw_stdout
+
     return CLIResult(
-        exit_code=result.returncode,
-        stdout=result.stdout,
-        stderr=result.stderr,
+        exit_code=exit_code,
+        stdout=stdout,
+        stderr=stderr,
         json_data=json_data,
     )
 
 
+def _run_cli_in_process(args: tuple[str, ...]) -> tuple[int, str, str]:
+    from src.schwab_client.cli import main as cli_main
+
+    out, err = io.StringIO(), io.StringIO()
+    exit_code = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            cli_main(list(args))
+        except SystemExit as exc:
+            if isinstance(exc.code, int):
+                exit_code = exc.code
+            elif exc.code is not None:
+                print(exc.code, file=sys.stderr)
+                exit_code = 1
+    return exit_code, out.getvalue(), err.getvalue()
+
+
+def _run_cli_subprocess(args: tuple[str, ...], timeout: int) -> tuple[int, bytes, str]:
+    # stdout stays as bytes so --json output is parsed without a separate decode pass.
+    # close_fds=False skips the per-spawn fd sweep; the child is our own CLI, so
+    # inheriting the test process's descriptors is acceptable here.
+    result = _subprocess.run(
+        [*_CLI_COMMAND, *args],
+        capture_output=True,
+        close_fds=False,
+        shell=False,
+        timeout=timeout,
+        cwd=_REPO_ROOT,
+    )
+    return result.returncode, result.stdout, result.stderr.decode("utf-8", "replace")
+
+
+_ENVELOPE_TEMPLATE: MappingProxyType[str, Any] = MappingProxyType(
+    {
+        "schema_version": 1,
+        "command": "test",
+        "timestamp": "2025-01-20T10:30:00",
+        "success": True,
+        "data": {},
+        "error": None,
+    }
+)
+
+
+def make_envelope(*, drop: tuple[str, ...] = (), **overrides: Any) -> dict[str, Any]:
+    """Build a fresh envelope from the shared template.
+
+    Keys in ``drop`` are left out and ``overrides`` replace or add fields.
+    """
+    envelope = {key: value for key, value in _ENVELOPE_TEMPLATE.items() if key not in drop}
+    envelope.update(overrides)
+    return envelope
+
+
+def make_response(payload: Any = None, status_code: int = 200, headers: Any = None) -> Any:
+    """Build a canned raw-client response whose ``json()`` returns ``payload``."""
+    return SimpleNamespace(
+        json=lambda: payload,
+        raise_for_status=lambda: None,
+        status_code=status_code,
+        headers=headers or {},
+    )
+
+
 def validate_envelope(data: dict[str, Any]) -> list[str]:
     """Validate JSON response against envelope schema.
 
@@ -86,9 +169,8 @@ def validate_envelope(data: dict[str, Any]) -> list[str]:
     errors: list[str] = []
 
     # Check required fields
-    for field in ENVELOPE_SCHEMA["required"]:
-        if field not in data:
-            errors.append(f"Missing required field: {field}")
+    missing = _ENVELOPE_REQUIRED - data.keys()
+    errors.extend(f"Missing required field: {field}" for field in sorted(missing))
 
     # Check schema_version
     if "schema_version" in data:
@@ -106,8 +188,7 @@ def validate_envelope(data: dict[str, Any]) -> list[str]:
             errors.append(f"Invalid success type: {type(data['success'])}")
 
     # Check no extra fields
-    allowed = set(ENVELOPE_SCHEMA["properties"].keys())
-    extra = set(data.keys()) - allowed
+    extra = data.keys() - _ENVELOPE_ALLOWED
     if extra:
         errors.append(f"Unexpected fields: {extra}")
 
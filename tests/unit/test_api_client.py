@@ -1,23 +1,119 @@
 """Integration tests for Schwab API client wrapper"""
 
-from unittest.mock import Mock, patch
-
+import enum
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, call, patch
+
+import httpx
 import pytest
+from schwab.client import Client
 
 from src.schwab_client import MONEY_MARKET_SYMBOLS, SchwabClientWrapper
+from src.schwab_client._client import common, portfolio
+from tests.conftest import make_response
+
+pytestmark = pytest.mark.parallel_safe
+
+# Read-only GET /accounts payloads; the wrapper never mutates decoded responses.
+_BASIC_ACCOUNTS = [
+    {
+        "securitiesAccount": {
+            "accountNumber": "12345678",
+            "currentBalances": {"liquidationValue": 100000, "cashBalance": 10000},
+            "positions": [
+                {
+                    "instrument": {"symbol": "AAPL", "assetType": "EQUITY"},
+                    "longQuantity": 100,
+                    "marketValue": 50000,
+                    "averagePrice": 450,
+                    "unrealizedProfitLoss": 5000,
+                    "unrealizedProfitLossPercentage": 10,
+                    "currentDayProfitLoss": 500,
+                    "currentDayProfitLossPercentage": 1,
+                }
+            ],
+        }
+    }
+]
+
+_MONEY_MARKET_ACCOUNTS = [
+    {
+        "securitiesAccount": {
+            "accountNumber": "12345678",
+            "currentBalances": {"liquidationValue": 100000, "cashBalance": 5000},
+            "positions": [
+                {
+                    "instrument": {"symbol": "SWVXX", "assetType": "MUTUAL_FUND"},
+                    "longQuantity": 15000,
+                    "marketValue": 15000,
+                    "averagePrice": 1,
+                    "unrealizedProfitLoss": 0,
+                    "currentDayProfitLoss": 0,
+                },
+                {
+                    "instrument": {"symbol": "AAPL", "assetType": "EQUITY"},
+                    "longQuantity": 100,
+                    "marketValue": 50000,
+                    "averagePrice": 450,
+                    "unrealizedProfitLoss": 5000,
+                    "currentDayProfitLoss": 500,
+                },
+            ],
+        }
+    }
+]
+
+_TWO_ACCOUNT_NUMBERS = [
+    {"accountNumber": "111", "hashValue": "H1"},
+    {"accountNumber": "222", "hashValue": "H2"},
+]
+
+
+def _accounts_stream(status_code=200, payload=()):
+    """Build a session.stream() context whose response fails with status_code or yields payload"""
+    request = httpx.Request("GET", "https://api.schwabapi.com/trader/v1/accounts")
+
+    def raise_for_status():
+        if status_code >= 400:
+            raise httpx.HTTPStatusError(
+                "stream failed", request=request, response=httpx.Response(status_code)
+            )
+
+    response = SimpleNamespace(
+        raise_for_status=raise_for_status,
+        iter_bytes=lambda: [json.dumps(list(payload)).encode()],
+    )
+    stream = MagicMock()
+    stream.__enter__.return_value = response
+    return stream
+
+
+@pytest.fixture(scope="module")
+def mock_raw_client():
+    """Create mock schwab-py client, shared across the module"""
+    client = Mock(spec=Client)
+    client.session = Mock()  # instance attribute, so the class spec does not list it
+    client.Account.Fields.POSITIONS = "POSITIONS"
+    return client
 
 
 class TestSchwabClientWrapper:
     """Tests for SchwabClientWrapper"""
 
+    @pytest.fixture(autouse=True)
+    def _reset_raw_client(self, mock_raw_client):
+        """Clear calls, return values and side effects left by the previous test"""
+        yield
+        mock_raw_client.reset_mock(return_value=True, side_effect=True)
+
     @pytest.fixture
-    def mock_raw_client(self):
-        """Create mock schwab-py client"""
-        client = Mock()
-        client.Account = Mock()
-        client.Account.Fields = Mock()
-        client.Account.Fields.POSITIONS = "POSITIONS"
-        return client
+    def mock_config(self):
+        """Patch the account config the trading mixin resolves aliases through"""
+        with patch("src.schwab_client.client.secure_config") as config:
+            yield config
 
     @pytest.fixture
     def wrapper(self, mock_raw_client):
@@ -28,15 +124,18 @@ class TestSchwabClientWrapper:
         """Test raw client is accessible"""
         assert wrapper.raw_client == mock_raw_client
 
+    def test_wrapper_uses_slots(self, wrapper):
+        """Test wrapper instances carry no per-instance __dict__"""
+        assert not hasattr(wrapper, "__dict__")
+
     def test_get_account_numbers(self, wrapper, mock_raw_client):
         """Test get_account_numbers returns account data"""
-        mock_response = Mock()
-        mock_response.json.return_value = [
-            {"accountNumber": "12345678", "hashValue": "ABC123"},
-            {"accountNumber": "87654321", "hashValue": "XYZ789"},
-        ]
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_account_numbers.return_value = mock_response
+        mock_raw_client.get_account_numbers.return_value = make_response(
+            [
+                {"accountNumber": "12345678", "hashValue": "ABC123"},
+                {"accountNumber": "87654321", "hashValue": "XYZ789"},
+            ]
+        )
 
         accounts = wrapper.get_account_numbers()
 
@@ -46,10 +145,9 @@ class TestSchwabClientWrapper:
 
     def test_get_account_hash_caches_values(self, wrapper, mock_raw_client):
         """Test get_account_hash caches and returns hash"""
-        mock_response = Mock()
-        mock_response.json.return_value = [{"accountNumber": "12345678", "hashValue": "ABC123"}]
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_account_numbers.return_value = mock_response
+        mock_raw_client.get_account_numbers.return_value = make_response(
+            [{"accountNumber": "12345678", "hashValue": "ABC123"}]
+        )
 
         # First call should fetch
         hash_value = wrapper.get_account_hash("12345678")
@@ -62,51 +160,85 @@ class TestSchwabClientWrapper:
 
     def test_get_account_hash_returns_none_for_unknown(self, wrapper, mock_raw_client):
         """Test get_account_hash returns None for unknown account"""
-        mock_response = Mock()
-        mock_response.json.return_value = [{"accountNumber": "12345678", "hashValue": "ABC123"}]
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_account_numbers.return_value = mock_response
+        mock_raw_client.get_account_numbers.return_value = make_response(
+            [{"accountNumber": "12345678", "hashValue": "ABC123"}]
+        )
 
         hash_value = wrapper.get_account_hash("99999999")
         assert hash_value is None
 
+    def test_unknown_account_lookups_fetch_hashes_once(self, wrapper, mock_raw_client):
+        """Test misses against live-fetched hashes do not trigger more requests"""
+        mock_raw_client.get_account_numbers.return_value = make_response(_TWO_ACCOUNT_NUMBERS)
+
+        assert [wrapper.get_account_hash("999") for _ in range(3)] == [None] * 3
+        mock_raw_client.get_account_numbers.assert_called_once()
+
+    def test_miss_against_disk_cache_refetches_once(self, mock_raw_client, tmp_path):
+        """Test a number missing from the saved hashes refreshes them a single time"""
+        cache_path = tmp_path / "account_hashes.json"
+        cache_path.write_text(json.dumps({"111": "H1"}))
+        mock_raw_client.get_account_numbers.return_value = make_response(_TWO_ACCOUNT_NUMBERS)
+        wrapper = SchwabClientWrapper(mock_raw_client, hash_cache_path=cache_path)
+
+        assert wrapper.get_account_hash("222") == "H2"
+        assert wrapper.get_account_hash("999") is None
+        mock_raw_client.get_account_numbers.assert_called_once()
+
     def test_get_all_accounts_full(self, wrapper, mock_raw_client):
         """Test get_all_accounts_full returns account data"""
-        mock_response = Mock()
-        mock_response.json.return_value = [{"securitiesAccount": {"accountNumber": "12345678"}}]
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_accounts.return_value = mock_response
+        mock_raw_client.get_accounts.return_value = make_response(
+            [{"securitiesAccount": {"accountNumber": "12345678"}}]
+        )
 
         accounts = wrapper.get_all_accounts_full()
 
         assert len(accounts) == 1
         mock_raw_client.get_accounts.assert_called_once()
 
+    def test_get_all_accounts_full_reuses_cached_payload(self, wrapper, mock_raw_client):
+        """Test portfolio views share one accounts fetch until invalidated"""
+        mock_raw_client.get_accounts.return_value = make_response(
+            [{"securitiesAccount": {"accountNumber": "12345678"}}]
+        )
+
+        snapshot = wrapper.portfolio_snapshot()
+        wrapper.get_portfolio_summary()
+        wrapper.get_account_balances()
+        assert mock_raw_client.get_accounts.call_count == 1
+        assert snapshot["summary"]["account_count"] == 1
+
+        wrapper.get_all_accounts_full(use_cache=False)
+        assert mock_raw_client.get_accounts.call_count == 2
+
+        wrapper.invalidate_cache()
+        wrapper.get_positions()
+        assert mock_raw_client.get_accounts.call_count == 3
+
+    def test_portfolio_views_are_rebuilt_from_the_cached_payload(self, wrapper, mock_raw_client):
+        """Test each view call aggregates the shared payload and returns an independent result"""
+        mock_raw_client.get_accounts.return_value = make_response(
+            [{"securitiesAccount": {"accountNumber": "12345678", "positions": []}}]
+        )
+
+        with patch(
+            "src.schwab_client._client.portfolio.build_portfolio_summary",
+            side_effect=lambda accounts, *_: {
+                "account_count": len(list(accounts)),
+                "positions": [],
+            },
+        ) as build:
+            first = wrapper.get_portfolio_summary()
+            first["positions"].append("mutated")
+            second = wrapper.get_portfolio_summary()
+
+        assert second["positions"] == []
+        assert build.call_count == 2
+        mock_raw_client.get_accounts.assert_called_once()
+
     def test_get_portfolio_summary_basic(self, wrapper, mock_raw_client):
         """Test get_portfolio_summary aggregates data correctly"""
-        mock_response = Mock()
-        mock_response.json.return_value = [
-            {
-                "securitiesAccount": {
-                    "accountNumber": "12345678",
-                    "currentBalances": {"liquidationValue": 100000, "cashBalance": 10000},
-                    "positions": [
-                        {
-                            "instrument": {"symbol": "AAPL", "assetType": "EQUITY"},
-                            "longQuantity": 100,
-                            "marketValue": 50000,
-                            "averagePrice": 450,
-                            "unrealizedProfitLoss": 5000,
-                            "unrealizedProfitLossPercentage": 10,
-                            "currentDayProfitLoss": 500,
-                            "currentDayProfitLossPercentage": 1,
-                        }
-                    ],
-                }
-            }
-        ]
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_accounts.return_value = mock_response
+        mock_raw_client.get_accounts.return_value = make_response(_BASIC_ACCOUNTS)
 
         summary = wrapper.get_portfolio_summary()
 
@@ -120,35 +252,7 @@ class TestSchwabClientWrapper:
 
     def test_get_portfolio_summary_money_market_as_cash(self, wrapper, mock_raw_client):
         """Test money market funds are counted as cash"""
-        mock_response = Mock()
-        mock_response.json.return_value = [
-            {
-                "securitiesAccount": {
-                    "accountNumber": "12345678",
-                    "currentBalances": {"liquidationValue": 100000, "cashBalance": 5000},
-                    "positions": [
-                        {
-                            "instrument": {"symbol": "SWVXX", "assetType": "MUTUAL_FUND"},
-                            "longQuantity": 15000,
-                            "marketValue": 15000,
-                            "averagePrice": 1,
-                            "unrealizedProfitLoss": 0,
-                            "currentDayProfitLoss": 0,
-                        },
-                        {
-                            "instrument": {"symbol": "AAPL", "assetType": "EQUITY"},
-                            "longQuantity": 100,
-                            "marketValue": 50000,
-                            "averagePrice": 450,
-                            "unrealizedProfitLoss": 5000,
-                            "currentDayProfitLoss": 500,
-                        },
-                    ],
-                }
-            }
-        ]
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_accounts.return_value = mock_response
+        mock_raw_client.get_accounts.return_value = make_response(_MONEY_MARKET_ACCOUNTS)
 
         summary = wrapper.get_portfolio_summary()
 
@@ -163,104 +267,347 @@ class TestSchwabClientWrapper:
         expected = {"SWGXX", "SWVXX", "SNOXX", "SNSXX", "SNVXX"}
         assert MONEY_MARKET_SYMBOLS == expected
 
-    def test_get_quote(self, wrapper, mock_raw_client):
-        """Test get_quote returns quote data"""
-        mock_response = Mock()
-        mock_response.json.return_value = {"AAPL": {"lastPrice": 150.00}}
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_quote.return_value = mock_response
-
-        quote = wrapper.get_quote("AAPL")
+    @pytest.mark.parametrize(
+        ("method", "args", "raw_attr", "payload", "expected_call"),
+        [
+            ("get_quote", ("AAPL",), "get_quote", {"AAPL": {"lastPrice": 150.0}}, call("AAPL")),
+            (
+                "get_quotes",
+                (["AAPL", "MSFT"],),
+                "get_quotes",
+                {"AAPL": {"lastPrice": 150.0}, "MSFT": {"lastPrice": 350.0}},
+                call(["AAPL", "MSFT"]),
+            ),
+            (
+                "get_account",
+                ("ABC123", True),
+                "get_account",
+                {
+                    "securitiesAccount": {
+                        "accountNumber": "12345678",
+                        "positions": [{"instrument": {"symbol": "AAPL"}}],
+                    }
+                },
+                call("ABC123", fields="POSITIONS"),
+            ),
+            (
+                "get_account",
+                ("ABC123", False),
+                "get_account",
+                {"securitiesAccount": {"accountNumber": "12345678"}},
+                call("ABC123"),
+            ),
+        ],
+        ids=["quote", "quotes", "account_with_positions", "account_without_positions"],
+    )
+    def test_read_methods_return_decoded_payload(
+        self, wrapper, mock_raw_client, method, args, raw_attr, payload, expected_call
+    ):
+        """Test single-request read methods return the decoded response body"""
+        raw_method = getattr(mock_raw_client, raw_attr)
+        raw_method.return_value = make_response(payload)
+
+        assert getattr(wrapper, method)(*args) == payload
+        assert raw_method.call_args_list == [expected_call]
+
+    def test_get_quotes_batched_merges_chunks(self, wrapper, mock_raw_client):
+        """Test get_quotes_batched splits symbols into chunks and merges results"""
+
+        def quotes_response(symbols):
+            return make_response({symbol: {"lastPrice": 1.0} for symbol in symbols})
+
+        mock_raw_client.get_quotes.side_effect = quotes_response
+
+        quotes = wrapper.get_quotes_batched(["A", "B", "C", "D", "E"], chunk_size=2)
+
+        assert sorted(quotes) == ["A", "B", "C", "D", "E"]
+        assert mock_raw_client.get_quotes.call_count == 3
+
+    def test_quotes_are_served_from_cache(self, wrapper, mock_raw_client):
+        """Test repeated quote lookups within the TTL reuse the first response"""
+        mock_raw_client.get_quote.return_value = make_response({"AAPL": {"lastPrice": 1.0}})
+        mock_raw_client.get_quotes.return_value = make_response({"MSFT": {"lastPrice": 2.0}})
+
+        wrapper.get_quote("AAPL")
+        quotes = wrapper.get_quotes(["AAPL", "MSFT"])
+        wrapper.get_quote("AAPL")
 
-        assert quote["AAPL"]["lastPrice"] == 150.00
+        assert quotes == {"AAPL": {"lastPrice": 1.0}, "MSFT": {"lastPrice": 2.0}}
         mock_raw_client.get_quote.assert_called_once_with("AAPL")
+        mock_raw_client.get_quotes.assert_called_once_with(["MSFT"])
 
-    def test_get_quotes_multiple(self, wrapper, mock_raw_client):
-        """Test get_quotes returns multiple quotes"""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "AAPL": {"lastPrice": 150.00},
-            "MSFT": {"lastPrice": 350.00},
-        }
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_quotes.return_value = mock_response
+        wrapper.clear_quote_cache()
+        wrapper.get_quote("AAPL")
+        assert mock_raw_client.get_quote.call_count == 2
 
-        quotes = wrapper.get_quotes(["AAPL", "MSFT"])
+    def test_concurrent_get_quote_calls_share_one_request(self, wrapper, mock_raw_client):
+        """Test concurrent lookups of one symbol are coalesced into one request"""
+        release = threading.Event()
 
-        assert len(quotes) == 2
-        assert quotes["AAPL"]["lastPrice"] == 150.00
-        assert quotes["MSFT"]["lastPrice"] == 350.00
-
-    def test_get_account_with_positions(self, wrapper, mock_raw_client):
-        """Test get_account with positions included"""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "securitiesAccount": {
-                "accountNumber": "12345678",
-                "positions": [{"instrument": {"symbol": "AAPL"}}],
-            }
-        }
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_account.return_value = mock_response
+        def slow_quote(symbol):
+            release.wait(timeout=5)
+            return make_response({symbol: {"lastPrice": 1.0}})
 
-        account = wrapper.get_account("ABC123", include_positions=True)
+        mock_raw_client.get_quote.side_effect = slow_quote
 
-        assert "positions" in account["securitiesAccount"]
-        mock_raw_client.get_account.assert_called_once()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(wrapper.get_quote, "AAPL") for _ in range(4)]
+            release.set()
+            results = [future.result() for future in futures]
 
-    def test_get_account_without_positions(self, wrapper, mock_raw_client):
-        """Test get_account without positions"""
-        mock_response = Mock()
-        mock_response.json.return_value = {"securitiesAccount": {"accountNumber": "12345678"}}
-        mock_response.raise_for_status = Mock()
-        mock_raw_client.get_account.return_value = mock_response
+        assert all(result == {"AAPL": {"lastPrice": 1.0}} for result in results)
+        assert mock_raw_client.get_quote.call_count == 1
 
-        account = wrapper.get_account("ABC123", include_positions=False)
+    def test_get_transactions_resolves_type_by_name(self, wrapper, mock_raw_client, monkeypatch):
+        """Test transaction types are looked up by name from the client enum"""
 
-        assert account is not None
-        mock_raw_client.get_account.assert_called_once_with("ABC123")
+        class TransactionType(enum.Enum):
+            TRADE = "TRADE"
+            DIVIDEND_OR_INTEREST = "DIVIDEND_OR_INTEREST"
+
+        monkeypatch.setattr(mock_raw_client.Transactions, "TransactionType", TransactionType)
+        mock_raw_client.get_transactions.return_value = make_response([{"type": "TRADE"}])
+
+        assert wrapper.get_transactions("ABC123", transaction_type="DIVIDEND_OR_INTEREST")
+        _, kwargs = mock_raw_client.get_transactions.call_args
+        assert kwargs["transaction_types"] is TransactionType.DIVIDEND_OR_INTEREST
+        with pytest.raises(ValueError, match="Unknown transaction type"):
+            wrapper.get_transactions("ABC123", transaction_type="BOGUS")
+
+    def test_get_orders_all_accounts_keys_by_account_number(self, wrapper, mock_raw_client):
+        """Test per-account fan-out resolves hashes once and keys results by number"""
+        mock_raw_client.get_account_numbers.return_value = make_response(_TWO_ACCOUNT_NUMBERS)
+
+        def orders_response(account_hash):
+            return make_response([{"accountHash": account_hash}])
+
+        mock_raw_client.get_orders_for_account.side_effect = orders_response
+
+        orders = wrapper.get_orders_all_accounts()
+
+        assert orders == {"111": [{"accountHash": "H1"}], "222": [{"accountHash": "H2"}]}
+        mock_raw_client.get_account_numbers.assert_called_once()
+
+    def test_get_transactions_all_accounts_limits_fan_out(self, wrapper, mock_raw_client):
+        """Test account_numbers restricts the fan-out to those accounts' hashes"""
+        mock_raw_client.get_account_numbers.return_value = make_response(_TWO_ACCOUNT_NUMBERS)
+        mock_raw_client.get_transactions.return_value = make_response([])
+
+        with patch.object(SchwabClientWrapper, "_transaction_type"):
+            transactions = wrapper.get_transactions_all_accounts(
+                transaction_type="DIVIDEND_OR_INTEREST", account_numbers={"222", "999"}
+            )
+
+        assert transactions == {"222": []}
+        mock_raw_client.get_transactions.assert_called_once()
+        assert mock_raw_client.get_transactions.call_args.args == ("H2",)
+
+    def test_fan_out_refreshes_hashes_missing_from_disk_cache(self, mock_raw_client, tmp_path):
+        """Test a requested account absent from the saved hashes is resolved, not skipped"""
+        cache_path = tmp_path / "account_hashes.json"
+        cache_path.write_text(json.dumps({"111": "H1"}))
+        mock_raw_client.get_account_numbers.return_value = make_response(_TWO_ACCOUNT_NUMBERS)
+        mock_raw_client.get_transactions.return_value = make_response([])
+        wrapper = SchwabClientWrapper(mock_raw_client, hash_cache_path=cache_path)
+
+        with patch.object(SchwabClientWrapper, "_transaction_type"):
+            transactions = wrapper.get_transactions_all_accounts(account_numbers=["111", "222"])
+
+        assert transactions == {"111": [], "222": []}
+        mock_raw_client.get_account_numbers.assert_called_once()
+
+    def test_concurrent_get_account_hash_fetches_once(self, wrapper, mock_raw_client):
+        """Test threads racing on the first hash lookup share one API call"""
+        release = threading.Event()
+
+        def slow_numbers():
+            release.wait(timeout=5)
+            return make_response([{"accountNumber": "12345678", "hashValue": "ABC123"}])
+
+        mock_raw_client.get_account_numbers.side_effect = slow_numbers
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(wrapper.get_account_hash, "12345678") for _ in range(4)]
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert results == ["ABC123"] * 4
+        mock_raw_client.get_account_numbers.assert_called_once()
+
+    def test_context_manager_closes_session(self, wrapper, mock_raw_client):
+        """Test leaving the wrapper context closes the pooled HTTP session"""
+        with wrapper as client:
+            assert client is wrapper
+
+        mock_raw_client.session.close.assert_called_once()
+
+    def test_account_display_names_are_memoized(self, wrapper):
+        """Test display names are resolved once per account number"""
+        with patch(
+            "src.schwab_client.snapshot.get_account_display_name", return_value="Trading"
+        ) as resolve:
+            assert wrapper._get_account_display_name("12345678") == "Trading"
+            assert wrapper._get_account_display_name("12345678") == "Trading"
+            wrapper.invalidate_display_names()
+            wrapper._get_account_display_name("12345678")
+
+        assert resolve.call_count == 2
+
+    def test_account_views_stream_accounts_when_ijson_installed(self, mock_raw_client, monkeypatch):
+        """Test opted-in per-view methods consume the streamed accounts body"""
+        pytest.importorskip("ijson")
+        monkeypatch.setattr(portfolio, "IJSON_AVAILABLE", True)
+        positions = SimpleNamespace(value="positions")
+        monkeypatch.setattr(mock_raw_client.Account.Fields, "POSITIONS", positions)
+        wrapper = SchwabClientWrapper(mock_raw_client, stream_accounts=True)
+        body = (
+            b'[{"securitiesAccount": {"accountNumber": "12345678", '
+            b'"currentBalances": {"liquidationValue": 1000, "cashBalance": 100}, '
+            b'"positions": [{"instrument": {"symbol": "AAPL"}, "marketValue": 900}]}}]'
+        )
+        response = SimpleNamespace(
+            raise_for_status=lambda: None, iter_bytes=lambda: [body[:40], body[40:]]
+        )
+        stream = MagicMock()
+        stream.__enter__.return_value = response
+        mock_raw_client.session.stream.return_value = stream
+
+        with patch.object(SchwabClientWrapper, "_get_account_display_name", return_value="Acct"):
+            positions = wrapper.get_positions()
+            balances = wrapper.get_account_balances()
+
+        assert positions[0]["symbol"] == "AAPL"
+        assert balances[0]["cash_balance"] == 100
+        mock_raw_client.session.stream.assert_called_once_with(
+            "GET", portfolio.ACCOUNTS_URL, params={"fields": "positions"}
+        )
+        mock_raw_client.get_accounts.assert_not_called()
 
-    @patch("src.schwab_client.client.secure_config")
-    def test_buy_market_dry_run(self, mock_config, wrapper):
-        """Test buy_market dry-run preview payload."""
+    @pytest.fixture
+    def streaming_wrapper(self, mock_raw_client, monkeypatch):
+        """Create a wrapper with streaming opted in and a json-based item decoder"""
+        monkeypatch.setattr(portfolio, "IJSON_AVAILABLE", True)
+        monkeypatch.setattr(
+            portfolio, "_iter_json_array_items", lambda chunks: iter(json.loads(b"".join(chunks)))
+        )
+        monkeypatch.setattr("src.schwab_client._client.common.time.sleep", Mock())
+        return SchwabClientWrapper(mock_raw_client, stream_accounts=True)
+
+    def test_streamed_accounts_retry_transient_stream_errors(
+        self, streaming_wrapper, mock_raw_client
+    ):
+        """Test a 503 when opening the accounts stream is retried before any item is read"""
+        failing = _accounts_stream(503)
+        mock_raw_client.session.stream.side_effect = [
+            failing,
+            _accounts_stream(payload=_BASIC_ACCOUNTS),
+        ]
+
+        with patch.object(SchwabClientWrapper, "_get_account_display_name", return_value="Acct"):
+            positions = streaming_wrapper.get_positions()
+
+        assert positions[0]["symbol"] == "AAPL"
+        assert mock_raw_client.session.stream.call_count == 2
+        failing.__exit__.assert_called_once()
+        # The completed stream filled the cache get_all_accounts_full() reads from.
+        assert streaming_wrapper.get_all_accounts_full() == _BASIC_ACCOUNTS
+        assert mock_raw_client.session.stream.call_count == 2
+        mock_raw_client.get_accounts.assert_not_called()
+
+    def test_streamed_accounts_raise_non_transient_errors(self, streaming_wrapper, mock_raw_client):
+        """Test a 401 from the accounts stream propagates without a retry or cached payload"""
+        failing = _accounts_stream(401)
+        mock_raw_client.session.stream.return_value = failing
+
+        with pytest.raises(httpx.HTTPStatusError):
+            streaming_wrapper.analyze_allocation()
+
+        mock_raw_client.session.stream.assert_called_once()
+        failing.__exit__.assert_called_once()
+        assert streaming_wrapper._fresh_snapshot() is None
+
+    def test_account_views_use_get_accounts_by_default(self, wrapper, mock_raw_client):
+        """Test per-view methods fetch through get_accounts unless streaming is opted in"""
+        mock_raw_client.get_accounts.return_value = make_response([])
+
+        assert wrapper.get_positions() == []
+
+        mock_raw_client.get_accounts.assert_called_once()
+        mock_raw_client.session.stream.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("method", "args", "expected"),
+        [
+            (
+                "buy_market",
+                ("acct_trading", "aapl", 10),
+                {"action": "BUY", "order_type": "MARKET", "symbol": "AAPL", "quantity": 10},
+            ),
+            (
+                "sell_limit",
+                ("acct_trading", "msft", 5, 320.5),
+                {
+                    "action": "SELL",
+                    "order_type": "LIMIT",
+                    "symbol": "MSFT",
+                    "quantity": 5,
+                    "limit_price": "320.50",
+                },
+            ),
+        ],
+        ids=["buy_market", "sell_limit"],
+    )
+    def test_dry_run_preview_payload(
+        self, mock_config, wrapper, monkeypatch, method, args, expected
+    ):
+        """Test dry-run previews carry the order fields and masked account metadata"""
         mock_config.get_account_number.return_value = "12345678"
         account_info = Mock()
         account_info.label = "Trading"
         mock_config.get_account_info.return_value = account_info
-        wrapper.get_account_hash = Mock(return_value="ABC123")
+        monkeypatch.setattr(SchwabClientWrapper, "get_account_hash", Mock(return_value="ABC123"))
 
-        preview = wrapper.buy_market("acct_trading", "aapl", 10, dry_run=True)
+        preview = getattr(wrapper, method)(*args, dry_run=True)
 
         assert preview["dry_run"] is True
-        assert preview["action"] == "BUY"
-        assert preview["order_type"] == "MARKET"
-        assert preview["symbol"] == "AAPL"
-        assert preview["quantity"] == 10
         assert preview["account"] == "Trading"
         assert preview["account_number_masked"] == "...5678"
-        assert "limit_price" not in preview
-
-    @patch("src.schwab_client.client.secure_config")
-    def test_sell_limit_dry_run_includes_limit_price(self, mock_config, wrapper):
-        """Test sell_limit dry-run includes limit price and expected metadata."""
+        assert {key: preview.get(key) for key in expected} == expected
+        if "limit_price" in expected:
+            assert preview["order"]["price"] == expected["limit_price"]
+        else:
+            assert "limit_price" not in preview
+
+    def test_trade_account_resolution_is_cached(self, mock_config, wrapper, monkeypatch):
+        """Test repeated orders for one alias resolve the account only once."""
         mock_config.get_account_number.return_value = "12345678"
-        account_info = Mock()
-        account_info.label = "Trading"
-        mock_config.get_account_info.return_value = account_info
-        wrapper.get_account_hash = Mock(return_value="ABC123")
+        mock_config.get_account_info.return_value = None
+        monkeypatch.setattr(SchwabClientWrapper, "get_account_hash", Mock(return_value="ABC123"))
 
-        preview = wrapper.sell_limit("acct_trading", "msft", 5, 320.5, dry_run=True)
+        wrapper.buy_market("acct_trading", "aapl", 1, dry_run=True)
+        preview = wrapper.sell_market("acct_trading", "aapl", 1, dry_run=True)
+
+        assert preview["account"] == "acct_trading"
+        assert mock_config.get_account_number.call_count == 1
+        assert wrapper.get_account_hash.call_count == 1
+
+    def test_warmup_prefetches_trade_accounts(self, mock_config, wrapper, mock_raw_client):
+        """Test warmup resolves every configured alias from one hash fetch."""
+        mock_config.get_all_accounts.return_value = {
+            "acct_trading": Mock(account_number="12345678", label="Trading"),
+            "acct_closed": Mock(account_number="99999999", label="Closed"),
+        }
+        mock_raw_client.get_account_numbers.return_value = make_response(
+            [{"accountNumber": "12345678", "hashValue": "ABC123"}]
+        )
+
+        assert wrapper.warmup() == 1
+        preview = wrapper.buy_market("acct_trading", "aapl", 1, dry_run=True)
 
-        assert preview["dry_run"] is True
-        assert preview["action"] == "SELL"
-        assert preview["order_type"] == "LIMIT"
-        assert preview["symbol"] == "MSFT"
-        assert preview["quantity"] == 5
-        assert preview["limit_price"] == 320.5
         assert preview["account"] == "Trading"
-        assert preview["account_number_masked"] == "...5678"
+        mock_config.get_account_number.assert_not_called()
+        mock_raw_client.get_account_numbers.assert_called_once()
 
-    @patch("src.schwab_client.client.secure_config")
     def test_cancel_order_returns_unknown_account_error(self, mock_config, wrapper):
         """Test cancel_order keeps unknown-account error behavior."""
         mock_config.get_account_number.return_value = None
@@ -268,3 +615,89 @@ class TestSchwabClientWrapper:
         result = wrapper.cancel_order("missing_alias", "123")
 
         assert result == {"success": False, "error": "Unknown account alias: missing_alias"}
+
+    def test_account_hashes_persist_across_wrappers(self, mock_raw_client, tmp_path):
+        """Test account hashes are read back from disk instead of refetched."""
+        cache_path = tmp_path / "account_hashes.json"
+        mock_raw_client.get_account_numbers.return_value = make_response(
+            [{"accountNumber": "12345678", "hashValue": "ABC123"}]
+        )
+        SchwabClientWrapper(mock_raw_client, hash_cache_path=cache_path).get_account_hash(
+            "12345678"
+        )
+        mock_raw_client.get_account_numbers.reset_mock()
+
+        reloaded = SchwabClientWrapper(mock_raw_client, hash_cache_path=cache_path)
+
+        assert reloaded.get_account_hash("12345678") == "ABC123"
+        mock_raw_client.get_account_numbers.assert_not_called()
+        reloaded.forget_account_hashes()
+        assert not cache_path.exists()
+
+    def test_stale_saved_hash_is_dropped_and_retried_on_404(self, mock_raw_client, tmp_path):
+        """Test a 404 on a read clears the hash cache and retries with the refreshed hash"""
+        cache_path = tmp_path / "account_hashes.json"
+        cache_path.write_text(json.dumps({"111": "STALE", "222": "H2"}))
+        mock_raw_client.get_account_numbers.return_value = make_response(_TWO_ACCOUNT_NUMBERS)
+
+        def orders_response(account_hash):
+            if account_hash == "STALE":
+                return make_response(status_code=404)
+            return make_response([{"accountHash": account_hash}])
+
+        mock_raw_client.get_orders_for_account.side_effect = orders_response
+        wrapper = SchwabClientWrapper(mock_raw_client, hash_cache_path=cache_path)
+
+        orders = wrapper.get_orders_all_accounts()
+
+        assert orders == {"111": [{"accountHash": "H1"}], "222": [{"accountHash": "H2"}]}
+        mock_raw_client.get_account_numbers.assert_called_once()
+        assert json.loads(cache_path.read_text()) == {"111": "H1", "222": "H2"}
+
+    def test_place_order_rechecks_pending_status(self, wrapper, mock_raw_client):
+        """Test a pending order status is re-polled instead of reported as unknown."""
+        mock_raw_client.place_order.return_value = make_response(
+            status_code=201, headers={"Location": "/accounts/ABC123/orders/987"}
+        )
+        mock_raw_client.get_order.side_effect = [
+            make_response({"status": "PENDING_ACKNOWLEDGEMENT"}),
+            make_response({"status": "FILLED"}),
+        ]
+
+        result = wrapper.place_order("ABC123", {"orderType": "MARKET"}, poll_schedule=(0,))
+
+        assert result["status"] == "FILLED"
+        assert mock_raw_client.get_order.call_count == 2
+        assert wrapper.get_known_order_status("987") == result
+
+    def test_place_order_stops_polling_on_canceled_order(self, wrapper, mock_raw_client):
+        """Test a canceled order ends the status check with a failure result."""
+        mock_raw_client.place_order.return_value = make_response(
+            status_code=201, headers={"Location": "/accounts/ABC123/orders/987"}
+        )
+        mock_raw_client.get_order.return_value = make_response(
+            {"status": "CANCELED", "statusDescription": "By user"}
+        )
+
+        result = wrapper.place_order("ABC123", {"orderType": "MARKET"}, poll_schedule=(0, 0))
+
+        assert result["success"] is False
+        assert result["error"] == "Order canceled: By user"
+        mock_raw_client.get_order.assert_called_once()
+
+    def test_decode_json_falls_back_without_orjson(self, monkeypatch):
+        """Test response decoding uses response.json() when orjson is unavailable."""
+        monkeypatch.setattr(common, "ORJSON_AVAILABLE", False)
+        response = make_response({"AAPL": {"lastPrice": 150.0}})
+        response.content = b'{"AAPL": {"lastPrice": 1.0}}'
+
+        assert common._decode_json(response) == {"AAPL": {"lastPrice": 150.0}}
+
+    def test_decode_json_uses_orjson_on_raw_bytes(self, monkeypatch):
+        """Test response decoding hands the raw body bytes to orjson when it is installed."""
+        monkeypatch.setattr(common, "ORJSON_AVAILABLE", True)
+        monkeypatch.setattr(common, "orjson", SimpleNamespace(loads=json.loads), raising=False)
+        response = make_response({"AAPL": {"lastPrice": 150.0}})
+        response.content = b'{"AAPL": {"lastPrice": 1.0}}'
+
+        assert common._decode_json(response) == {"AAPL": {"lastPrice": 1.0}}
@@ -3,7 +3,7 @@
 import json
 import os
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -13,6 +13,64 @@ from src.core.errors import ConfigError
 from src.schwab_client.auth import TokenManager, get_authenticated_client, resolve_data_dir
 from src.schwab_client.market_auth import resolve_market_callback_url, resolve_market_token_path
 
+pytestmark = pytest.mark.parallel_safe
+
+_FROZEN_NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Pin the token module's clock so expiry math is exact."""
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return _FROZEN_NOW
+
+    monkeypatch.setattr("src.schwab_client.auth_tokens.datetime", _FrozenDatetime)
+    return _FROZEN_NOW
+
+
+@pytest.fixture(scope="module")
+def seeded_token_file(tmp_path_factory):
+    """Token file shared by tests that only read it; mutating tests write their own."""
+    token_file = tmp_path_factory.mktemp("seeded_token") / "token.json"
+    token_file.write_bytes(b'{"access_token": "test123", "refresh_token": "refresh456"}')
+    return token_file
+
+
+@pytest.fixture(scope="session")
+def token_file_factory(tmp_path_factory):
+    """Write one legacy token file per age (relative to the frozen clock), written once."""
+    cache = {}
+
+    def make(age: timedelta) -> Path:
+        if age not in cache:
+            token_path = tmp_path_factory.mktemp("aged_token") / "token.json"
+            token_path.write_bytes(_legacy_token_bytes(_FROZEN_NOW - age))
+            cache[age] = token_path
+        return cache[age]
+
+    return make
+
+
+def _legacy_token_bytes(created: datetime) -> bytes:
+    """Serialize an access-token-only payload; only the timestamp varies between tests."""
+    return b'{"access_token": "test", "creation_timestamp": "%s"}' % created.isoformat().encode()
+
+
+def _write_token(**kwargs):
+    """easy_client stand-in that writes a fresh token where the caller asked."""
+    Path(kwargs["token_path"]).write_text(
+        json.dumps(
+            {
+                "creation_timestamp": datetime.now().isoformat(),
+                "token": {"access_token": "test", "expires_at": datetime.now().timestamp()},
+            }
+        )
+    )
+    return Mock()
+
 
 class TestPathResolution:
     """Tests for public/default auth path resolution."""
@@ -26,57 +84,78 @@ class TestPathResolution:
         assert path.name == ".cli-schwab"
         assert "Madad" not in str(path)
 
-    @patch.dict(
-        os.environ,
-        {
-            "SCHWAB_CLI_DATA_DIR": "/tmp/schwab-data",
-            "SCHWAB_INTEL_APP_KEY": "same-key",
-            "SCHWAB_INTEL_CLIENT_SECRET": "same-secret",
-            "SCHWAB_INTEL_CALLBACK_URL": "https://127.0.0.1:8001",
-            "SCHWAB_MARKET_APP_KEY": "same-key",
-            "SCHWAB_MARKET_CLIENT_SECRET": "same-secret",
-        },
-        clear=True,
-    )
-    def test_market_auth_reuses_portfolio_token_for_same_oauth_app_by_default(self):
+    def test_default_data_dir_follows_home(self, monkeypatch, tmp_path):
+        """Default data dir should track HOME changes despite memoization."""
+        monkeypatch.delenv("SCHWAB_CLI_DATA_DIR", raising=False)
+        resolve_data_dir()
+        monkeypatch.setenv("HOME", str(tmp_path))
+
+        assert resolve_data_dir() == tmp_path / ".cli-schwab"
+
+    def test_data_dir_override_expands_against_current_home(self, monkeypatch, tmp_path):
+        """A ``~`` data-dir override should expand against HOME at call time."""
+        monkeypatch.setenv("SCHWAB_CLI_DATA_DIR", "~/data")
+        resolve_data_dir()
+        monkeypatch.setenv("HOME", str(tmp_path))
+
+        assert resolve_data_dir() == tmp_path / "data"
+
+    @pytest.fixture
+    def schwab_env(self, monkeypatch):
+        """Drop inherited SCHWAB_* settings; returns a setter for the ones a test needs"""
+        for name in [name for name in os.environ if name.startswith("SCHWAB_")]:
+            monkeypatch.delenv(name)
+
+        def apply(**values: str) -> None:
+            for name, value in values.items():
+                monkeypatch.setenv(name, value)
+
+        return apply
+
+    def test_market_auth_reuses_portfolio_token_for_same_oauth_app_by_default(self, schwab_env):
+        schwab_env(
+            SCHWAB_CLI_DATA_DIR="/tmp/schwab-data",
+            SCHWAB_INTEL_APP_KEY="same-key",
+            SCHWAB_INTEL_CLIENT_SECRET="same-secret",
+            SCHWAB_INTEL_CALLBACK_URL="https://127.0.0.1:8001",
+            SCHWAB_MARKET_APP_KEY="same-key",
+            SCHWAB_MARKET_CLIENT_SECRET="same-secret",
+        )
+
         assert resolve_market_token_path() == Path("/tmp/schwab-data/tokens/schwab_token.json")
         assert resolve_market_callback_url() == "https://127.0.0.1:8001"
 
-    @patch.dict(
-        os.environ,
-        {
-            "SCHWAB_CLI_DATA_DIR": "/tmp/schwab-data",
-            "SCHWAB_INTEL_APP_KEY": "same-key",
-            "SCHWAB_INTEL_CLIENT_SECRET": "same-secret",
-            "SCHWAB_MARKET_APP_KEY": "same-key",
-            "SCHWAB_MARKET_CLIENT_SECRET": "same-secret",
-            "SCHWAB_MARKET_CALLBACK_URL": "https://127.0.0.1:8002",
-            "SCHWAB_MARKET_TOKEN_PATH": "/tmp/market-token.json",
-        },
-        clear=True,
-    )
-    def test_explicit_market_auth_settings_override_same_oauth_app_defaults(self):
+    def test_explicit_market_auth_settings_override_same_oauth_app_defaults(self, schwab_env):
+        schwab_env(
+            SCHWAB_CLI_DATA_DIR="/tmp/schwab-data",
+            SCHWAB_INTEL_APP_KEY="same-key",
+            SCHWAB_INTEL_CLIENT_SECRET="same-secret",
+            SCHWAB_MARKET_APP_KEY="same-key",
+            SCHWAB_MARKET_CLIENT_SECRET="same-secret",
+            SCHWAB_MARKET_CALLBACK_URL="https://127.0.0.1:8002",
+            SCHWAB_MARKET_TOKEN_PATH="/tmp/market-token.json",
+        )
+
         assert resolve_market_token_path() == Path("/tmp/market-token.json")
         assert resolve_market_callback_url() == "https://127.0.0.1:8002"
 
-    @patch.dict(
-        os.environ,
-        {
-            "SCHWAB_CLI_DATA_DIR": "/tmp/schwab-data",
-            "SCHWAB_INTEL_APP_KEY": "portfolio-key",
-            "SCHWAB_INTEL_CLIENT_SECRET": "portfolio-secret",
-            "SCHWAB_MARKET_APP_KEY": "market-key",
-            "SCHWAB_MARKET_CLIENT_SECRET": "market-secret",
-        },
-        clear=True,
-    )
-    def test_market_auth_uses_market_token_for_distinct_oauth_app(self):
-        assert resolve_market_token_path() == Path("/tmp/schwab-data/tokens/schwab_market_token.json")
+    def test_market_auth_uses_market_token_for_distinct_oauth_app(self, schwab_env):
+        schwab_env(
+            SCHWAB_CLI_DATA_DIR="/tmp/schwab-data",
+            SCHWAB_INTEL_APP_KEY="portfolio-key",
+            SCHWAB_INTEL_CLIENT_SECRET="portfolio-secret",
+            SCHWAB_MARKET_APP_KEY="market-key",
+            SCHWAB_MARKET_CLIENT_SECRET="market-secret",
+        )
+
+        expected = Path("/tmp/schwab-data/tokens/schwab_market_token.json")
+        assert resolve_market_token_path() == expected
         assert resolve_market_callback_url() == "https://127.0.0.1:8002"
 
-    def test_token_manager_default_path_is_resolved_at_call_time(self, tmp_path):
-        with patch.dict(os.environ, {"SCHWAB_CLI_DATA_DIR": str(tmp_path)}, clear=True):
-            manager = TokenManager()
+    def test_token_manager_default_path_is_resolved_at_call_time(self, tmp_path, schwab_env):
+        schwab_env(SCHWAB_CLI_DATA_DIR=str(tmp_path))
+
+        manager = TokenManager()
 
         assert manager.token_path == tmp_path / "tokens" / "schwab_token.json"
 
@@ -94,9 +173,7 @@ class TestTokenManager:
     def test_get_token_info_syncs_sidecar_db(self, tmp_path):
         """Reading token info should persist derived metadata to SQLite."""
         token_file = tmp_path / "token.json"
-        token_file.write_text(
-            json.dumps({"access_token": "test", "creation_timestamp": datetime.now().isoformat()})
-        )
+        token_file.write_bytes(_legacy_token_bytes(datetime.now()))
 
         manager = TokenManager(token_path=token_file)
         info = manager.get_token_info()
@@ -115,14 +192,12 @@ class TestTokenManager:
     def test_get_token_info_falls_back_to_cached_metadata_when_file_corrupted(self, tmp_path):
         """Corrupted token files should still expose cached metadata from SQLite."""
         token_file = tmp_path / "token.json"
-        token_file.write_text(
-            json.dumps({"access_token": "test", "creation_timestamp": datetime.now().isoformat()})
-        )
+        token_file.write_bytes(_legacy_token_bytes(datetime.now()))
 
         manager = TokenManager(token_path=token_file)
         initial = manager.get_token_info()
 
-        token_file.write_text("not valid json {{{")
+        token_file.write_bytes(b"not valid json {{{")
         info = manager.get_token_info()
 
         assert info["exists"] is True
@@ -133,9 +208,7 @@ class TestTokenManager:
     def test_delete_tokens_clears_sidecar_state(self, tmp_path):
         """Deleting a token should also remove its cached SQLite metadata."""
         token_file = tmp_path / "token.json"
-        token_file.write_text(
-            json.dumps({"access_token": "test", "creation_timestamp": datetime.now().isoformat()})
-        )
+        token_file.write_bytes(_legacy_token_bytes(datetime.now()))
 
         manager = TokenManager(token_path=token_file)
         manager.get_token_info()
@@ -153,11 +226,9 @@ class TestTokenManager:
         manager = TokenManager(token_path=tmp_path / "nonexistent.json")
         assert not manager.tokens_exist()
 
-    def test_tokens_exist_true_when_present(self, tmp_path):
+    def test_tokens_exist_true_when_present(self, seeded_token_file):
         """Test tokens_exist returns True when file exists"""
-        token_file = tmp_path / "token.json"
-        token_file.write_text('{"access_token": "test"}')
-        manager = TokenManager(token_path=token_file)
+        manager = TokenManager(token_path=seeded_token_file)
         assert manager.tokens_exist()
 
     def test_load_tokens_returns_none_when_missing(self, tmp_path):
@@ -165,13 +236,9 @@ class TestTokenManager:
         manager = TokenManager(token_path=tmp_path / "nonexistent.json")
         assert manager.load_tokens() is None
 
-    def test_load_tokens_returns_data_when_present(self, tmp_path):
+    def test_load_tokens_returns_data_when_present(self, seeded_token_file):
         """Test load_tokens returns data when file exists"""
-        token_file = tmp_path / "token.json"
-        token_data = {"access_token": "test123", "refresh_token": "refresh456"}
-        token_file.write_text(json.dumps(token_data))
-
-        manager = TokenManager(token_path=token_file)
+        manager = TokenManager(token_path=seeded_token_file)
         loaded = manager.load_tokens()
 
         assert loaded is not None
@@ -181,7 +248,7 @@ class TestTokenManager:
     def test_load_tokens_handles_invalid_json(self, tmp_path):
         """Test load_tokens handles corrupted file"""
         token_file = tmp_path / "token.json"
-        token_file.write_text("not valid json {{{")
+        token_file.write_bytes(b"not valid json {{{")
 
         manager = TokenManager(token_path=token_file)
         assert manager.load_tokens() is None
@@ -197,7 +264,7 @@ class TestTokenManager:
     def test_delete_tokens(self, tmp_path):
         """Test delete_tokens removes file"""
         token_file = tmp_path / "token.json"
-        token_file.write_text('{"access_token": "test"}')
+        token_file.write_bytes(b'{"access_token": "test"}')
 
         manager = TokenManager(token_path=token_file)
         assert manager.tokens_exist()
@@ -215,13 +282,11 @@ class TestTokenManager:
 class TestTokenExpiration:
     """Tests for token expiration warnings."""
 
-    def test_access_only_token_uses_access_expiry_window(self, tmp_path):
+    def test_access_only_token_uses_access_expiry_window(self, tmp_path, frozen_now):
         """Tokens without refresh tokens should expire at access-token expiry."""
-        from datetime import datetime, timedelta
-
         token_path = tmp_path / "access_only_token.json"
-        created = datetime.now() - timedelta(minutes=5)
-        access_expires = datetime.now() + timedelta(minutes=25)
+        created = frozen_now - timedelta(minutes=5)
+        access_expires = frozen_now + timedelta(minutes=25)
         token_data = {
             "creation_timestamp": created.isoformat(),
             "token": {
@@ -236,16 +301,14 @@ class TestTokenExpiration:
 
         assert info["exists"] is True
         assert info["valid"] is True
-        assert info["expires_in_hours"] < 1
+        assert info["expires_in_hours"] == 0.4
         assert info["expires_in_days"] == 0
 
-    def test_refreshable_token_uses_refresh_expiry_window(self, tmp_path):
+    def test_refreshable_token_uses_refresh_expiry_window(self, tmp_path, frozen_now):
         """Tokens with refresh tokens should still use the 7-day refresh window."""
-        from datetime import datetime, timedelta
-
         token_path = tmp_path / "refreshable_token.json"
-        created = datetime.now() - timedelta(minutes=5)
-        access_expires = datetime.now() + timedelta(minutes=25)
+        created = frozen_now - timedelta(minutes=5)
+        access_expires = frozen_now + timedelta(minutes=25)
         token_data = {
             "creation_timestamp": created.isoformat(),
             "token": {
@@ -261,87 +324,34 @@ class TestTokenExpiration:
 
         assert info["exists"] is True
         assert info["valid"] is True
-        assert info["expires_in_hours"] > 24 * 6
-        assert info["expires_in_days"] >= 6
-
-    def test_token_info_includes_hours_remaining(self, tmp_path):
-        """Test token info includes hours remaining."""
-        from datetime import datetime, timedelta
-
-        # Create a token that expires in 2 days
-        token_path = tmp_path / "test_token.json"
-        created = datetime.now() - timedelta(days=5)  # 5 days old, 2 days left
-        token_data = {
-            "access_token": "test",
-            "creation_timestamp": created.isoformat(),
-        }
-        token_path.write_text(json.dumps(token_data))
-
-        manager = TokenManager(token_path=token_path)
-        info = manager.get_token_info()
+        assert info["expires_in_hours"] == 167.9
+        assert info["expires_in_days"] == 6
+
+    @pytest.mark.parametrize(
+        ("age", "valid", "warning_level", "warning_keyword"),
+        [
+            (timedelta(days=5), True, None, None),
+            (timedelta(days=7) - timedelta(hours=12), True, "critical", "hours"),
+            (timedelta(days=7) - timedelta(hours=36), True, "warning", None),
+            (timedelta(days=8), False, "critical", "expired"),
+        ],
+        ids=["two_days_left", "under_24h", "under_48h", "expired"],
+    )
+    def test_token_warning_levels(
+        self, token_file_factory, frozen_now, age, valid, warning_level, warning_keyword
+    ):
+        """Test expiry hours and warning level follow the token's age."""
+        info = TokenManager(token_path=token_file_factory(age)).get_token_info()
 
         assert info["exists"] is True
-        assert info["valid"] is True
-        assert "expires_in_hours" in info
-        assert info["expires_in_hours"] > 0
-        assert info["expires_in_hours"] < 72  # Less than 3 days
-
-    def test_token_critical_warning_under_24h(self, tmp_path):
-        """Test critical warning when token expires in < 24 hours."""
-        from datetime import datetime, timedelta
-
-        # Create a token that expires in 12 hours
-        token_path = tmp_path / "test_token.json"
-        created = datetime.now() - timedelta(days=7) + timedelta(hours=12)
-        token_data = {
-            "access_token": "test",
-            "creation_timestamp": created.isoformat(),
-        }
-        token_path.write_text(json.dumps(token_data))
-
-        manager = TokenManager(token_path=token_path)
-        info = manager.get_token_info()
-
-        assert info["warning_level"] == "critical"
-        assert "hours" in info["warning"].lower()
-
-    def test_token_warning_under_48h(self, tmp_path):
-        """Test warning when token expires in 24-48 hours."""
-        from datetime import datetime, timedelta
-
-        # Create a token that expires in 36 hours
-        token_path = tmp_path / "test_token.json"
-        created = datetime.now() - timedelta(days=7) + timedelta(hours=36)
-        token_data = {
-            "access_token": "test",
-            "creation_timestamp": created.isoformat(),
-        }
-        token_path.write_text(json.dumps(token_data))
-
-        manager = TokenManager(token_path=token_path)
-        info = manager.get_token_info()
-
-        assert info["warning_level"] == "warning"
-
-    def test_expired_token_detected(self, tmp_path):
-        """Test expired token is detected."""
-        from datetime import datetime, timedelta
-
-        # Create an expired token (8 days old)
-        token_path = tmp_path / "test_token.json"
-        created = datetime.now() - timedelta(days=8)
-        token_data = {
-            "access_token": "test",
-            "creation_timestamp": created.isoformat(),
-        }
-        token_path.write_text(json.dumps(token_data))
-
-        manager = TokenManager(token_path=token_path)
-        info = manager.get_token_info()
-
-        assert info["valid"] is False
-        assert info["warning_level"] == "critical"
-        assert "expired" in info["warning"].lower()
+        assert info["valid"] is valid
+        if valid:
+            remaining = timedelta(days=7) - age
+            assert info["expires_in_hours"] == remaining.total_seconds() / 3600
+        if warning_level is not None:
+            assert info["warning_level"] == warning_level
+        if warning_keyword is not None:
+            assert warning_keyword in info["warning"].lower()
 
     def test_missing_token_warning(self, tmp_path):
         """Test missing token gives critical warning."""
@@ -357,169 +367,78 @@ class TestTokenExpiration:
 class TestGetAuthenticatedClient:
     """Tests for get_authenticated_client"""
 
-    def test_raises_without_credentials(self, monkeypatch):
-        """Test raises ConfigError without credentials"""
+    @pytest.fixture(autouse=True)
+    def _clean_credentials_env(self, monkeypatch):
+        """Start every test without portfolio credentials, whatever .env provided"""
         monkeypatch.delenv("SCHWAB_INTEL_APP_KEY", raising=False)
         monkeypatch.delenv("SCHWAB_INTEL_CLIENT_SECRET", raising=False)
 
+    def test_raises_without_credentials(self):
+        """Test raises ConfigError without credentials"""
         with pytest.raises(ConfigError, match="Missing Schwab credentials"):
             get_authenticated_client()
 
     def test_raises_with_partial_credentials(self, monkeypatch):
         """Test raises ConfigError with only one credential"""
         monkeypatch.setenv("SCHWAB_INTEL_APP_KEY", "test_key")
-        monkeypatch.delenv("SCHWAB_INTEL_CLIENT_SECRET", raising=False)
 
         with pytest.raises(ConfigError, match="Missing Schwab credentials"):
             get_authenticated_client()
 
-    @staticmethod
-    def _write_token_side_effect(token_path: Path):
-        def _side_effect(**kwargs):
-            Path(kwargs["token_path"]).write_text(
-                json.dumps(
-                    {
-                        "creation_timestamp": datetime.now().isoformat(),
-                        "token": {
-                            "access_token": "test",
-                            "expires_at": datetime.now().timestamp(),
-                        },
-                    }
-                )
-            )
-            return Mock()
-
-        del token_path
-        return _side_effect
-
-    @patch("schwab.auth.easy_client")
-    @patch("schwab.auth.client_from_access_functions")
-    def test_returns_client_with_valid_creds(
-        self, mock_managed, mock_easy, monkeypatch, tmp_path
-    ):
-        """Test returns managed client when credentials valid"""
+    @pytest.fixture
+    def schwab_auth(self, monkeypatch):
+        """Set credentials and patch schwab.auth; yields (easy_client, managed client)"""
         monkeypatch.setenv("SCHWAB_INTEL_APP_KEY", "test_key")
         monkeypatch.setenv("SCHWAB_INTEL_CLIENT_SECRET", "test_secret")
-
-        managed = Mock()
-        managed.token_age.return_value = 0
-        mock_managed.return_value = managed
-        token_path = tmp_path / "token.json"
-        mock_easy.side_effect = self._write_token_side_effect(token_path)
-
-        result = get_authenticated_client(token_path=token_path)
-
-        assert result == managed
-        mock_easy.assert_called_once()
-
-    @patch("schwab.auth.easy_client")
-    @patch("schwab.auth.client_from_access_functions")
-    def test_uses_env_credentials(self, mock_managed, mock_easy, monkeypatch, tmp_path):
-        """Test uses credentials from environment"""
-        monkeypatch.setenv("SCHWAB_INTEL_APP_KEY", "env_key")
-        monkeypatch.setenv("SCHWAB_INTEL_CLIENT_SECRET", "env_secret")
-
         managed = Mock()
         managed.token_age.return_value = 0
-        mock_managed.return_value = managed
-        token_path = tmp_path / "token.json"
-        mock_easy.side_effect = self._write_token_side_effect(token_path)
-
-        get_authenticated_client(token_path=token_path)
-
-        call_kwargs = mock_easy.call_args[1]
-        assert call_kwargs["api_key"] == "env_key"
-        assert call_kwargs["app_secret"] == "env_secret"
-
-    @patch("schwab.auth.easy_client")
-    @patch("schwab.auth.client_from_access_functions")
-    def test_uses_explicit_credentials_over_env(
-        self, mock_managed, mock_easy, monkeypatch, tmp_path
+        with (
+            patch("schwab.auth.easy_client", side_effect=_write_token) as easy,
+            patch("schwab.auth.client_from_access_functions", return_value=managed),
+        ):
+            yield easy, managed
+
+    @pytest.mark.parametrize(
+        ("credentials", "expected_key", "expected_secret"),
+        [
+            ({}, "test_key", "test_secret"),
+            (
+                {"api_key": "explicit_key", "app_secret": "explicit_secret"},
+                "explicit_key",
+                "explicit_secret",
+            ),
+        ],
+        ids=["env", "explicit_over_env"],
+    )
+    def test_builds_client_with_resolved_credentials(
+        self, schwab_auth, tmp_path, credentials, expected_key, expected_secret
     ):
-        """Test explicit credentials override environment"""
-        monkeypatch.setenv("SCHWAB_INTEL_APP_KEY", "env_key")
-        monkeypatch.setenv("SCHWAB_INTEL_CLIENT_SECRET", "env_secret")
-
-        managed = Mock()
-        managed.token_age.return_value = 0
-        mock_managed.return_value = managed
-        token_path = tmp_path / "token.json"
-        mock_easy.side_effect = self._write_token_side_effect(token_path)
+        """Test explicit credentials win over env and the managed client is returned"""
+        easy, managed = schwab_auth
 
-        get_authenticated_client(
-            api_key="explicit_key", app_secret="explicit_secret", token_path=token_path
-        )
+        result = get_authenticated_client(token_path=tmp_path / "token.json", **credentials)
 
-        call_kwargs = mock_easy.call_args[1]
-        assert call_kwargs["api_key"] == "explicit_key"
-        assert call_kwargs["app_secret"] == "explicit_secret"
+        assert result == managed
+        easy.assert_called_once()
+        call_kwargs = easy.call_args.kwargs
+        assert call_kwargs["api_key"] == expected_key
+        assert call_kwargs["app_secret"] == expected_secret
 
-    @patch("schwab.auth.easy_client")
-    @patch("schwab.auth.client_from_access_functions")
-    def test_creates_token_directory(
-        self, mock_client_from_access, mock_easy, monkeypatch, tmp_path
-    ):
+    def test_creates_token_directory(self, schwab_auth, tmp_path):
         """Test creates token directory if needed"""
-        monkeypatch.setenv("SCHWAB_INTEL_APP_KEY", "test_key")
-        monkeypatch.setenv("SCHWAB_INTEL_CLIENT_SECRET", "test_secret")
-
-        mock_client = Mock()
-        mock_client.token_age.return_value = 0
-        mock_client_from_access.return_value = mock_client
-
-        def write_token(**kwargs):
-            Path(kwargs["token_path"]).write_text(
-                json.dumps(
-                    {
-                        "creation_timestamp": datetime.now().isoformat(),
-                        "token": {"access_token": "test", "expires_at": datetime.now().timestamp()},
-                    }
-                )
-            )
-            return Mock()
-
-        mock_easy.configure_mock(side_effect=write_token)
-
         nested_path = tmp_path / "nested" / "dir" / "token.json"
         get_authenticated_client(token_path=nested_path)
 
         assert nested_path.parent.exists()
 
-    @patch("schwab.auth.easy_client")
-    @patch("schwab.auth.client_from_access_functions")
-    def test_get_authenticated_client_updates_sidecar_state(
-        self,
-        mock_client_from_access,
-        mock_easy,
-        monkeypatch,
-        tmp_path,
-    ):
+    def test_get_authenticated_client_updates_sidecar_state(self, schwab_auth, tmp_path):
         """Managed client creation should persist token metadata to SQLite."""
-        monkeypatch.setenv("SCHWAB_INTEL_APP_KEY", "test_key")
-        monkeypatch.setenv("SCHWAB_INTEL_CLIENT_SECRET", "test_secret")
-
-        managed_client = Mock()
-        managed_client.token_age.return_value = 0
-        mock_client_from_access.return_value = managed_client
-
+        _, managed = schwab_auth
         token_path = tmp_path / "token.json"
 
-        def write_token(**kwargs):
-            Path(kwargs["token_path"]).write_text(
-                json.dumps(
-                    {
-                        "creation_timestamp": datetime.now().isoformat(),
-                        "token": {"access_token": "test", "expires_at": datetime.now().timestamp()},
-                    }
-                )
-            )
-            return Mock()
-
-        mock_easy.configure_mock(side_effect=write_token)
-
         result = get_authenticated_client(token_path=token_path)
 
-        assert result == managed_client
+        assert result == managed
         manager = TokenManager(token_path=token_path)
         info = manager.get_token_info()
         assert info["exists"] is True
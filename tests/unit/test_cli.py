@@ -3,16 +3,82 @@
 import io
 import json
 from contextlib import redirect_stdout
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call, patch
 
+import httpx
 import pytest
-
+from schwab.client import Client
+
+from src.core.errors import ConfigError
+from src.schwab_client import SchwabClientWrapper
+from src.schwab_client.cli import main
+from src.schwab_client.cli.commands.admin import cmd_auth, cmd_auth_login, cmd_doctor
+from src.schwab_client.cli.commands.context_cmd import cmd_context
+from src.schwab_client.cli.commands.history import cmd_history
+from src.schwab_client.cli.commands.trade import ensure_trade_confirmation, is_live_trading_enabled
 from tests.conftest import (
     CLIResult,
+    json_loads,
+    make_response,
     run_cli,
     validate_envelope,
 )
 
+pytestmark = pytest.mark.parallel_safe
+
+
+# Shared read-only storage metadata; the admin commands only serialize it.
+_TOKEN_STORAGE_INFO = {
+    "token_path": "/tmp/token.json",
+    "db_path": "/tmp/tokens.db",
+    "storage_mode": "file+sqlite_sidecar",
+    "locking": "sqlite_begin_exclusive",
+}
+
+# Read-only raw API payloads; the wrapper decodes them without mutating.
+_ACCOUNTS_API_PAYLOAD = [
+    {
+        "securitiesAccount": {
+            "accountNumber": "12345678",
+            "type": "Individual",
+            "currentBalances": {
+                "liquidationValue": 100000,
+                "cashBalance": 10000,
+            },
+            "positions": [
+                {
+                    "instrument": {"symbol": "AAPL", "assetType": "EQUITY"},
+                    "longQuantity": 100,
+                    "marketValue": 50000,
+                    "averagePrice": 450,
+                    "unrealizedProfitLoss": 5000,
+                    "currentDayProfitLoss": 500,
+                }
+            ],
+        }
+    }
+]
+_ORDERS_PAYLOAD = [
+    {"orderId": "123", "status": "FILLED"},
+    {"orderId": "456", "status": "PENDING"},
+]
+
+
+@pytest.fixture
+def wired_wrapper():
+    """Wrapper over a Client-spec'd mock; each test wires only the endpoints it hits."""
+    raw = MagicMock(spec=Client)
+    return SchwabClientWrapper(raw), raw
+
+
+@pytest.fixture
+def mock_config():
+    """Patch the admin commands' secure_config; no accounts are configured by default."""
+    with patch("src.schwab_client.cli.commands.admin.secure_config") as config:
+        config.get_all_accounts.return_value = {}
+        yield config
+
 
 class TestCLIHelp:
     """Tests for CLI help output."""
@@ -43,86 +109,24 @@ class TestCLIHelp:
         assert result.exit_code != 0
 
 
-class TestJSONEnvelope:
-    """Tests for JSON response envelope format."""
-
-    def test_envelope_schema_validation(self):
-        """Test envelope validation function works."""
-        valid = {
-            "schema_version": 1,
-            "command": "test",
-            "timestamp": "2025-01-01T00:00:00",
-            "success": True,
-            "data": {},
-            "error": None,
-        }
-        assert validate_envelope(valid) == []
-
-    def test_envelope_missing_required_field(self):
-        """Test envelope validation catches missing fields."""
-        invalid = {"schema_version": 1, "command": "test"}
-        errors = validate_envelope(invalid)
-        assert len(errors) > 0
-        assert any("timestamp" in e or "success" in e for e in errors)
-
-    def test_envelope_wrong_schema_version(self):
-        """Test envelope validation catches wrong schema version."""
-        invalid = {
-            "schema_version": 2,
-            "command": "test",
-            "timestamp": "2025-01-01T00:00:00",
-            "success": True,
-        }
-        errors = validate_envelope(invalid)
-        assert any("schema_version" in e for e in errors)
-
-    def test_envelope_extra_fields_rejected(self):
-        """Test envelope validation catches unexpected fields."""
-        invalid = {
-            "schema_version": 1,
-            "command": "test",
-            "timestamp": "2025-01-01T00:00:00",
-            "success": True,
-            "extra_field": "bad",
-        }
-        errors = validate_envelope(invalid)
-        assert any("extra" in e.lower() for e in errors)
-
-
 class TestTradeSafety:
     """Tests for trade safety mechanisms."""
 
-    def test_live_trading_disabled_by_default(self):
+    def test_live_trading_disabled_by_default(self, monkeypatch):
         """Test live trading is blocked without env var."""
-        import os
-
-        from src.schwab_client.cli.commands.trade import is_live_trading_enabled
-
-        # Ensure env var is not set
-        os.environ.pop("SCHWAB_ALLOW_LIVE_TRADES", None)
+        monkeypatch.delenv("SCHWAB_ALLOW_LIVE_TRADES", raising=False)
 
         assert is_live_trading_enabled() is False
 
-    def test_live_trading_enabled_with_env_var(self):
+    def test_live_trading_enabled_with_env_var(self, monkeypatch):
         """Test live trading enabled with env var."""
-        import os
-
-        from src.schwab_client.cli.commands.trade import is_live_trading_enabled
+        monkeypatch.setenv("SCHWAB_ALLOW_LIVE_TRADES", "true")
 
-        os.environ["SCHWAB_ALLOW_LIVE_TRADES"] = "true"
-        try:
-            assert is_live_trading_enabled() is True
-        finally:
-            os.environ.pop("SCHWAB_ALLOW_LIVE_TRADES", None)
+        assert is_live_trading_enabled() is True
 
-    def test_ensure_trade_blocks_without_env_var(self):
+    def test_ensure_trade_blocks_without_env_var(self, monkeypatch):
         """Test ensure_trade_confirmation blocks live trades."""
-        import os
-
-        from src.core.errors import ConfigError
-        from src.schwab_client.cli.commands.trade import ensure_trade_confirmation
-
-        os.environ.pop("SCHWAB_ALLOW_LIVE_TRADES", None)
+        monkeypatch.delenv("SCHWAB_ALLOW_LIVE_TRADES", raising=False)
 
         with pytest.raises(ConfigError, match="Live trading is disabled"):
             ensure_trade_confirmation(
@@ -132,13 +136,9 @@ class TestTradeSafety:
                 non_interactive=False,
             )
 
-    def test_ensure_trade_allows_dry_run(self):
+    def test_ensure_trade_allows_dry_run(self, monkeypatch):
         """Test dry-run is always allowed."""
-        import os
-
-        from src.schwab_client.cli.commands.trade import ensure_trade_confirmation
-
-        os.environ.pop("SCHWAB_ALLOW_LIVE_TRADES", None)
+        monkeypatch.delenv("SCHWAB_ALLOW_LIVE_TRADES", raising=False)
 
         # Should not raise - dry_run is always allowed
         ensure_trade_confirmation(
@@ -180,33 +180,28 @@ class TestCLIResult:
 class TestAccountsCommandJSON:
     """Tests for accounts command JSON output."""
 
-    @patch("src.schwab_client.cli.commands.admin.secure_config")
     def test_accounts_json_envelope(self, mock_config):
         """Test accounts --json returns valid envelope."""
-        mock_info = MagicMock()
-        mock_info.alias = "test_acct"
-        mock_info.label = "Test"
-        mock_info.name = "Test Account"
-        mock_info.account_type = "Individual"
-        mock_info.tax_status = "taxable"
-        mock_info.category = "trading"
-        mock_info.account_number = "12345678"
-        mock_info.description = None
+        mock_info = SimpleNamespace(
+            alias="test_acct",
+            label="Test",
+            name="Test Account",
+            account_type="Individual",
+            tax_status="taxable",
+            category="trading",
+            account_number="12345678",
+            notes=None,
+        )
 
         mock_config.get_all_accounts.return_value = {"test_acct": mock_info}
 
         # Capture stdout
-        import io
-        from contextlib import redirect_stdout
-
-        from src.schwab_client.cli import main
-
         f = io.StringIO()
         with redirect_stdout(f):
             main(["accounts", "--json"])
 
         output = f.getvalue()
-        data = json.loads(output)
+        data = json_loads(output)
 
         errors = validate_envelope(data)
         assert not errors, f"Envelope errors: {errors}"
@@ -220,16 +215,12 @@ class TestAuthRouting:
 
     @patch("src.schwab_client.cli.cmd_auth")
     def test_auth_defaults_to_status(self, mock_cmd_auth):
-        from src.schwab_client.cli import main
-
         main(["auth"])
 
         mock_cmd_auth.assert_called_once_with(output_mode="text", rail="portfolio")
 
     @patch("src.schwab_client.cli.cmd_auth_login")
     def test_auth_login_routes_to_market_rail(self, mock_cmd_auth_login):
-        from src.schwab_client.cli import main
-
         main(["auth", "login", "--market", "--manual", "--force"])
 
         mock_cmd_auth_login.assert_called_once_with(
@@ -249,37 +240,27 @@ class TestAuthAdminCommands:
     @patch("src.schwab_client.cli.commands.admin.TokenManager")
     def test_auth_json_includes_storage_metadata(self, mock_manager_cls):
         """auth --json should expose sidecar/locking status explicitly."""
-        from src.schwab_client.cli.commands.admin import cmd_auth
-
         mock_manager = MagicMock()
         mock_manager.get_token_info.return_value = {
             "exists": True,
             "valid": True,
             "db_path": "/tmp/tokens.db",
         }
-        mock_manager.get_storage_info.return_value = {
-            "token_path": "/tmp/token.json",
-            "db_path": "/tmp/tokens.db",
-            "storage_mode": "file+sqlite_sidecar",
-            "locking": "sqlite_begin_exclusive",
-        }
+        mock_manager.get_storage_info.return_value = _TOKEN_STORAGE_INFO
         mock_manager_cls.return_value = mock_manager
 
         output = io.StringIO()
         with redirect_stdout(output):
             cmd_auth(output_mode="json")
 
-        payload = json.loads(output.getvalue())
+        payload = json_loads(output.getvalue())
         assert payload["command"] == "auth"
         assert payload["data"]["storage"]["db_path"] == "/tmp/tokens.db"
         assert payload["data"]["storage"]["locking"] == "sqlite_begin_exclusive"
 
-    @patch("src.schwab_client.cli.commands.admin.secure_config")
     @patch("src.schwab_client.cli.commands.admin.TokenManager")
     def test_doctor_text_shows_token_db_paths(self, mock_manager_cls, mock_config):
         """doctor text output should surface the token sidecar database paths."""
-        from src.schwab_client.cli.commands.admin import cmd_doctor
-
         mock_manager = MagicMock()
         mock_manager.get_token_info.return_value = {
             "exists": True,
@@ -287,15 +268,9 @@ class TestAuthAdminCommands:
             "expires_in_hours": 48.0,
             "expires_in_days": 2,
         }
-        mock_manager.get_storage_info.return_value = {
-            "token_path": "/tmp/token.json",
-            "db_path": "/tmp/tokens.db",
-            "storage_mode": "file+sqlite_sidecar",
-            "locking": "sqlite_begin_exclusive",
-        }
+        mock_manager.get_storage_info.return_value = _TOKEN_STORAGE_INFO
         mock_manager.db_path = "/tmp/tokens.db"
         mock_manager_cls.return_value = mock_manager
-        mock_config.get_all_accounts.return_value = {}
 
         output = io.StringIO()
         with redirect_stdout(output):
@@ -305,12 +280,9 @@ class TestAuthAdminCommands:
         assert "Token DB:" in text
         assert "/tmp/tokens.db" in text
 
-    @patch("src.schwab_client.cli.commands.admin.secure_config")
     @patch("src.schwab_client.cli.commands.admin.TokenManager")
     def test_doctor_json_includes_storage_metadata(self, mock_manager_cls, mock_config):
         """doctor --json should expose token storage metadata for both auth rails."""
-        from src.schwab_client.cli.commands.admin import cmd_doctor
-
         mock_manager = MagicMock()
         mock_manager.get_token_info.return_value = {
             "exists": True,
@@ -318,20 +290,14 @@ class TestAuthAdminCommands:
             "expires_in_hours": 48.0,
             "expires_in_days": 2,
         }
-        mock_manager.get_storage_info.return_value = {
-            "token_path": "/tmp/token.json",
-            "db_path": "/tmp/tokens.db",
-            "storage_mode": "file+sqlite_sidecar",
-            "locking": "sqlite_begin_exclusive",
-        }
+        mock_manager.get_storage_info.return_value = _TOKEN_STORAGE_INFO
         mock_manager_cls.return_value = mock_manager
-        mock_config.get_all_accounts.return_value = {}
 
         output = io.StringIO()
         with redirect_stdout(output):
             cmd_doctor(output_mode="json")
 
-        payload = json.loads(output.getvalue())
+        payload = json_loads(output.getvalue())
         assert payload["command"] == "doctor"
         assert payload["data"]["portfolio"]["storage"]["db_path"] == "/tmp/tokens.db"
         assert payload["data"]["market"]["storage"]["locking"] == "sqlite_begin_exclusive"
@@ -340,8 +306,6 @@ class TestAuthAdminCommands:
 @patch("src.schwab_client.cli.commands.admin.authenticate_interactive")
 @patch("src.schwab_client.cli.commands.admin.TokenManager")
 def test_cmd_auth_login_portfolio_reauth(mock_manager_cls, mock_authenticate_interactive):
-    from src.schwab_client.cli.commands.admin import cmd_auth_login
-
     manager = MagicMock()
     manager.get_token_info = MagicMock(
         side_effect=[
@@ -369,8 +333,6 @@ class TestContextCommand:
     @patch("src.schwab_client.cli.commands.context_cmd.PortfolioContext")
     def test_context_json_envelope(self, mock_context_cls, mock_get_client, mock_get_market_client):
         """Test context --json returns a valid envelope."""
-        from src.schwab_client.cli.commands.context_cmd import cmd_context
-
         mock_client = MagicMock()
         mock_market_client = MagicMock()
         mock_get_client.return_value = mock_client
@@ -395,7 +357,7 @@ class TestContextCommand:
         with redirect_stdout(output):
             cmd_context(output_mode="json")
 
-        payload = json.loads(output.getvalue())
+        payload = json_loads(output.getvalue())
         errors = validate_envelope(payload)
         assert not errors, f"Envelope errors: {errors}"
         assert payload["command"] == "context"
@@ -418,8 +380,6 @@ class TestContextCommand:
         tmp_path,
     ):
         """context --json --output should export the full payload and return a compact pointer."""
-        from src.schwab_client.cli.commands.context_cmd import cmd_context
-
         mock_client = MagicMock()
         mock_market_client = MagicMock()
         mock_get_client.return_value = mock_client
@@ -445,7 +405,7 @@ class TestContextCommand:
         with redirect_stdout(output):
             cmd_context(output_mode="json", output_path=str(output_path))
 
-        payload = json.loads(output.getvalue())
+        payload = json_loads(output.getvalue())
         assert payload["data"] == {
             "output_path": str(output_path),
             "output_type": "json",
@@ -466,8 +426,6 @@ class TestContextCommand:
         mock_get_market_client,
     ):
         """Test memo/review templates force the deeper Lynch analysis path."""
-        from src.schwab_client.cli.commands.context_cmd import cmd_context
-
         mock_client = MagicMock()
         mock_market_client = MagicMock()
         mock_get_client.return_value = mock_client
@@ -494,8 +452,6 @@ class TestHistoryCommand:
 
     @patch("src.schwab_client.cli.commands.history.HistoryStore")
     def test_history_snapshot_id_returns_exact_payload(self, mock_store_cls):
-        from src.schwab_client.cli.commands.history import cmd_history
-
         store = MagicMock()
         store.path = "/tmp/history.db"
         store.get_snapshot_payload.return_value = {
@@ -508,7 +464,7 @@ class TestHistoryCommand:
         with redirect_stdout(output):
             cmd_history(output_mode="json", snapshot_id=50)
 
-        payload = json.loads(output.getvalue())
+        payload = json_loads(output.getvalue())
         assert payload["data"] == {
             "db_path": "/tmp/history.db",
             "snapshot_id": 50,
@@ -523,8 +479,6 @@ class TestHistoryCommand:
     def test_history_snapshot_id_output_writes_file_and_returns_pointer(
         self, mock_store_cls, tmp_path
     ):
-        from src.schwab_client.cli.commands.history import cmd_history
-
         store = MagicMock()
         store.path = "/tmp/history.db"
         store.get_snapshot_payload.return_value = {
@@ -538,7 +492,7 @@ class TestHistoryCommand:
         with redirect_stdout(output):
             cmd_history(output_mode="json", snapshot_id=50, output_path=str(output_path))
 
-        payload = json.loads(output.getvalue())
+        payload = json_loads(output.getvalue())
         assert payload["data"] == {
             "db_path": "/tmp/history.db",
             "snapshot_id": 50,
@@ -550,40 +504,11 @@ class TestHistoryCommand:
 class TestPortfolioCommand:
     """Tests for portfolio command output."""
 
-    def test_portfolio_command_uses_wrapper(self):
+    def test_portfolio_command_uses_wrapper(self, wired_wrapper):
         """Test portfolio command uses Schwab client wrapper correctly."""
-        from src.schwab_client import SchwabClientWrapper
-
-        # Setup mock client
-        mock_raw_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.json.return_value = [
-            {
-                "securitiesAccount": {
-                    "accountNumber": "12345678",
-                    "type": "Individual",
-                    "currentBalances": {
-                        "liquidationValue": 100000,
-                        "cashBalance": 10000,
-                    },
-                    "positions": [
-                        {
-                            "instrument": {"symbol": "AAPL", "assetType": "EQUITY"},
-                            "longQuantity": 100,
-                            "marketValue": 50000,
-                            "averagePrice": 450,
-                            "unrealizedProfitLoss": 5000,
-                            "currentDayProfitLoss": 500,
-                        }
-                    ],
-                }
-            }
-        ]
-        mock_response.raise_for_status = MagicMock()
-        mock_raw_client.get_accounts.return_value = mock_response
+        wrapper, mock_raw_client = wired_wrapper
+        mock_raw_client.get_accounts.return_value = make_response(_ACCOUNTS_API_PAYLOAD)
 
-        # Create wrapper
-        wrapper = SchwabClientWrapper(mock_raw_client)
         summary = wrapper.get_portfolio_summary()
 
         assert summary["total_value"] == 100000
@@ -592,18 +517,59 @@ class TestPortfolioCommand:
         assert summary["account_count"] == 1
 
 
+class TestDividendsCommand:
+    """Tests for dividends command output."""
+
+    def test_failed_account_is_reported_not_fatal(self, wired_wrapper):
+        """Test one account's HTTP error skips that account and lists it in the output."""
+        wrapper, mock_raw_client = wired_wrapper
+        mock_raw_client.get_account_numbers.return_value = make_response(
+            [
+                {"accountNumber": "11111111", "hashValue": "H1"},
+                {"accountNumber": "22222222", "hashValue": "H2"},
+            ]
+        )
+        dividend = {"transactionType": "DIVIDEND", "symbol": "VTI", "amount": 12.5}
+        request = httpx.Request("GET", "https://api.schwabapi.com/trader/v1/accounts")
+
+        def transactions_response(account_hash, **_kwargs):
+            if account_hash == "H2":
+                raise httpx.HTTPStatusError(
+                    "forbidden", request=request, response=httpx.Response(403)
+                )
+            return make_response([dividend])
+
+        mock_raw_client.get_transactions.side_effect = transactions_response
+        f = io.StringIO()
+        with (
+            patch("src.schwab_client.cli.commands.market.get_client", return_value=wrapper),
+            patch("src.schwab_client.cli.commands.market.secure_config") as config,
+            patch.object(SchwabClientWrapper, "_transaction_type"),
+            redirect_stdout(f),
+        ):
+            config.get_all_accounts.return_value = {"one": None, "two": None}
+            config.get_account_number.side_effect = {"one": "11111111", "two": "22222222"}.get
+            config.mask_account_number.side_effect = lambda number: f"****{number[-4:]}"
+            main(["dividends", "--json"])
+
+        data = json_loads(f.getvalue())
+        assert data["success"] is True
+        assert [t["amount"] for t in data["data"]["transactions"]] == [12.5]
+        assert data["data"]["failed_accounts"] == ["****2222"]
+
+
 class TestAccountsCommand:
     """Tests for accounts list command."""
 
-    @patch("src.schwab_client.cli.commands.admin.secure_config")
     def test_list_accounts_returns_configured_accounts(self, mock_config):
         """Test listing configured accounts."""
-        mock_info = MagicMock()
-        mock_info.alias = "acct_trading"
-        mock_info.label = "Trading"
-        mock_info.account_type = "Individual"
-        mock_info.account_number = "12345678"
-        mock_info.get_display_label.return_value = "Trading (...5678)"
+        mock_info = SimpleNamespace(
+            alias="acct_trading",
+            label="Trading",
+            account_type="Individual",
+            account_number="12345678",
+            get_display_label=lambda: "Trading (...5678)",
+        )
 
         mock_config.get_all_accounts.return_value = {"acct_trading": mock_info}
 
@@ -616,27 +582,19 @@ class TestAccountsCommand:
 class TestClientOrderMethods:
     """Tests for order-related client methods."""
 
-    def test_place_order_builds_correct_structure(self):
+    def test_place_order_builds_correct_structure(self, wired_wrapper):
         """Test placing equity order via client wrapper."""
-        from src.schwab_client import SchwabClientWrapper
-
-        mock_raw_client = MagicMock()
+        wrapper, mock_raw_client = wired_wrapper
 
         # Mock get_account_numbers
-        mock_numbers_response = MagicMock()
-        mock_numbers_response.json.return_value = [
-            {"accountNumber": "12345678", "hashValue": "ABC123"}
-        ]
-        mock_numbers_response.raise_for_status = MagicMock()
-        mock_raw_client.get_account_numbers.return_value = mock_numbers_response
+        mock_raw_client.get_account_numbers.return_value = make_response(
+            [{"accountNumber": "12345678", "hashValue": "ABC123"}]
+        )
 
         # Mock place_order
-        mock_order_response = MagicMock()
-        mock_order_response.status_code = 201
-        mock_order_response.headers = {"Location": "orders/12345"}
-        mock_raw_client.place_order.return_value = mock_order_response
-
-        wrapper = SchwabClientWrapper(mock_raw_client)
+        mock_raw_client.place_order.return_value = make_response(
+            status_code=201, headers={"Location": "orders/12345"}
+        )
 
         order = {
             "orderType": "MARKET",
@@ -657,22 +615,13 @@ class TestClientOrderMethods:
         mock_raw_client.place_order.assert_called_once()
         assert result["success"] is True
 
-    def test_get_orders_returns_list(self):
+    def test_get_orders_returns_list(self, wired_wrapper):
         """Test getting orders returns list."""
-        from src.schwab_client import SchwabClientWrapper
-
-        mock_raw_client = MagicMock()
+        wrapper, mock_raw_client = wired_wrapper
 
         # Mock get_orders
-        mock_response = MagicMock()
-        mock_response.json.return_value = [
-            {"orderId": "123", "status": "FILLED"},
-            {"orderId": "456", "status": "PENDING"},
-        ]
-        mock_response.raise_for_status = MagicMock()
-        mock_raw_client.get_orders_for_account.return_value = mock_response
+        mock_raw_client.get_orders_for_account.return_value = make_response(_ORDERS_PAYLOAD)
 
-        wrapper = SchwabClientWrapper(mock_raw_client)
         orders = wrapper.get_orders("ABC123")
 
         assert len(orders) == 2
@@ -697,170 +646,117 @@ class TestCLICommandAliases:
 class TestCLIArgParsing:
     """Tests for CLI argument parsing."""
 
-    @patch("src.schwab_client.cli.cmd_portfolio")
-    def test_main_parses_portfolio_command(self, mock_cmd):
-        """Test main function parses portfolio command."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["portfolio"])
-
-        mock_cmd.assert_called_once_with(include_positions=False, output_mode="text")
-
-    @patch("src.schwab_client.cli.cmd_portfolio")
-    def test_main_parses_portfolio_with_positions(self, mock_cmd):
-        """Test main function parses portfolio -p flag."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["portfolio", "-p"])
-
-        mock_cmd.assert_called_once_with(include_positions=True, output_mode="text")
-
-    @patch("src.schwab_client.cli.cmd_balance")
-    def test_main_parses_balance_command(self, mock_cmd):
-        """Test main function parses balance command."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["balance"])
-
-        mock_cmd.assert_called_once_with(output_mode="text")
-
-    @patch("src.schwab_client.cli.cmd_context")
-    def test_main_parses_context_output_path(self, mock_cmd):
-        """context --output should pass the export path through."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["context", "--output", "./context.json", "--no-lynch"])
-
-        mock_cmd.assert_called_once_with(
-            output_mode="text",
-            include_lynch=False,
-            prompt=False,
-            template=None,
-            output_path="./context.json",
-        )
-
-    @patch("src.schwab_client.cli.cmd_accounts")
-    def test_main_parses_accounts_command(self, mock_cmd):
-        """Test main function parses accounts command."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["accounts"])
-
-        mock_cmd.assert_called_once_with(output_mode="text")
-
-    @patch("src.schwab_client.cli.cmd_report")
-    def test_main_parses_report_command(self, mock_cmd):
-        """Test main function parses report command."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["report"])
-
-        mock_cmd.assert_called_once_with(
-            output_mode="text",
-            output_path=None,
-            include_market=True,
-        )
-
-    @patch("src.schwab_client.cli.cmd_snapshot")
-    def test_main_parses_snapshot_command(self, mock_cmd):
-        """Test main function parses snapshot command."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["snapshot", "--output", "./out.json", "--no-market"])
-
-        mock_cmd.assert_called_once_with(
-            output_mode="text",
-            output_path="./out.json",
-            include_market=False,
-        )
-
-    @patch("src.schwab_client.cli.cmd_snapshot")
-    def test_main_parses_snapshot_command_with_default_output_path(self, mock_cmd):
-        """Test snapshot --output with no value uses the default output location."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["snapshot", "--output", "--no-market"])
-
-        mock_cmd.assert_called_once_with(
-            output_mode="text",
-            output_path="",
-            include_market=False,
-        )
-
-    @patch("src.schwab_client.cli.cmd_history")
-    def test_main_parses_history_command(self, mock_cmd):
-        """Test main function parses history command."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["history", "--dataset", "portfolio", "--limit", "5"])
-
-        mock_cmd.assert_called_once_with(
-            output_mode="text",
-            dataset="portfolio",
-            limit=5,
-            since=None,
-            symbol=None,
-            account=None,
-            snapshot_id=None,
-            output_path=None,
-            backfill_paths=None,
-        )
-
-    @patch("src.schwab_client.cli.cmd_history")
-    def test_main_parses_history_snapshot_read(self, mock_cmd):
-        """history --snapshot-id should route to the exact-read path."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["history", "--snapshot-id", "42", "--output", "./snapshot.json"])
-
-        mock_cmd.assert_called_once_with(
-            output_mode="text",
-            dataset="runs",
-            limit=20,
-            since=None,
-            symbol=None,
-            account=None,
-            snapshot_id=42,
-            output_path="./snapshot.json",
-            backfill_paths=None,
-        )
-
-    @patch("src.schwab_client.cli.cmd_query")
-    def test_main_parses_query_command(self, mock_cmd):
-        """Test main function parses query command."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["query", "SELECT 1"])
-
-        mock_cmd.assert_called_once_with("SELECT 1", output_mode="text")
-
-    @patch("src.schwab_client.cli.cmd_history")
-    def test_main_parses_history_import_defaults(self, mock_cmd):
-        """Test history --import-defaults triggers default backfill."""
-        from src.schwab_client.cli import main
-
-        with patch.dict("os.environ", {"SCHWAB_OUTPUT": "text"}):
-            main(["history", "--import-defaults"])
+    @pytest.fixture(autouse=True)
+    def _text_output(self, monkeypatch):
+        """Pin the output mode so routing assertions see output_mode="text"."""
+        monkeypatch.setenv("SCHWAB_OUTPUT", "text")
+
+    @pytest.mark.parametrize(
+        ("argv", "target", "expected_call"),
+        [
+            pytest.param(
+                ["portfolio"],
+                "cmd_portfolio",
+                call(include_positions=False, output_mode="text"),
+                id="portfolio",
+            ),
+            pytest.param(
+                ["portfolio", "-p"],
+                "cmd_portfolio",
+                call(include_positions=True, output_mode="text"),
+                id="portfolio-positions",
+            ),
+            pytest.param(["balance"], "cmd_balance", call(output_mode="text"), id="balance"),
+            pytest.param(["accounts"], "cmd_accounts", call(output_mode="text"), id="accounts"),
+            pytest.param(
+                ["context", "--output", "./context.json", "--no-lynch"],
+                "cmd_context",
+                call(
+                    output_mode="text",
+                    include_lynch=False,
+                    prompt=False,
+                    template=None,
+                    output_path="./context.json",
+                ),
+                id="context-output",
+            ),
+            pytest.param(
+                ["report"],
+                "cmd_report",
+                call(output_mode="text", output_path=None, include_market=True),
+                id="report",
+            ),
+            pytest.param(
+                ["snapshot", "--output", "./out.json", "--no-market"],
+                "cmd_snapshot",
+                call(output_mode="text", output_path="./out.json", include_market=False),
+                id="snapshot",
+            ),
+            pytest.param(
+                ["snapshot", "--output", "--no-market"],
+                "cmd_snapshot",
+                call(output_mode="text", output_path="", include_market=False),
+                id="snapshot-default-output",
+            ),
+            pytest.param(
+                ["history", "--dataset", "portfolio", "--limit", "5"],
+                "cmd_history",
+                call(
+                    output_mode="text",
+                    dataset="portfolio",
+                    limit=5,
+                    since=None,
+                    symbol=None,
+                    account=None,
+                    snapshot_id=None,
+                    output_path=None,
+                    backfill_paths=None,
+                ),
+                id="history",
+            ),
+            pytest.param(
+                ["history", "--snapshot-id", "42", "--output", "./snapshot.json"],
+                "cmd_history",
+                call(
+                    output_mode="text",
+                    dataset="runs",
+                    limit=20,
+                    since=None,
+                    symbol=None,
+                    account=None,
+                    snapshot_id=42,
+                    output_path="./snapshot.json",
+                    backfill_paths=None,
+                ),
+                id="history-snapshot-read",
+            ),
+            pytest.param(
+                ["history", "--import-defaults"],
+                "cmd_history",
+                call(
+                    output_mode="text",
+                    dataset="runs",
+                    limit=20,
+                    since=None,
+                    symbol=None,
+                    account=None,
+                    snapshot_id=None,
+                    output_path=None,
+                    backfill_paths=[],
+                ),
+                id="history-import-defaults",
+            ),
+            pytest.param(
+                ["query", "SELECT 1"],
+                "cmd_query",
+                call("SELECT 1", output_mode="text"),
+                id="query",
+            ),
+        ],
+    )
+    def test_main_routes_command(self, argv, target, expected_call):
+        """main() should dispatch each command to its handler with the parsed arguments."""
+        with patch(f"src.schwab_client.cli.{target}") as mock_cmd:
+            main(argv)
 
-        mock_cmd.assert_called_once_with(
-            output_mode="text",
-            dataset="runs",
-            limit=20,
-            since=None,
-            symbol=None,
-            account=None,
-            snapshot_id=None,
-            output_path=None,
-            backfill_paths=[],
-        )
+        assert mock_cmd.call_args_list == [expected_call]
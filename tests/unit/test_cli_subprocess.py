@@ -0,0 +1,13 @@
+"""CLI tests that spawn a real interpreter; kept out of the parallel_safe run."""
+
+from tests.conftest import run_cli
+
+
+class TestCLISubprocess:
+    """Tests for the isolated subprocess CLI path."""
+
+    def test_help_flag_in_subprocess(self):
+        """Test --help through the isolated subprocess path."""
+        result = run_cli("--help", subprocess=True)
+        assert result.exit_code == 0
+        assert "portfolio" in result.stdout
@@ -2,12 +2,15 @@
 
 import importlib
 import json
+from functools import cache
 from pathlib import Path
 from typing import Any
 
 import pytest
 
-from tests.conftest import validate_envelope
+from tests.conftest import make_envelope, validate_envelope
+
+pytestmark = pytest.mark.parallel_safe
 
 jsonschema: Any = None
 try:
@@ -19,12 +22,21 @@ except ImportError:
 SCHEMAS_DIR = Path(__file__).parent.parent.parent / "schemas"
 
 
+@cache
 def load_schema(name: str) -> dict[str, Any]:
-    """Load a JSON schema from the schemas directory."""
+    """Load a JSON schema from the schemas directory (parsed once per session; read-only)."""
     schema_path = SCHEMAS_DIR / f"{name}.json"
     return json.loads(schema_path.read_text())
 
 
+@cache
+def _get_validator(name: str) -> Any:
+    """Compile a draft-07 validator for a schema once; tests reuse it for every instance."""
+    schema = load_schema(name)
+    jsonschema.Draft7Validator.check_schema(schema)
+    return jsonschema.Draft7Validator(schema)
+
+
 class TestEnvelopeSchema:
     """Tests for the envelope schema."""
 
@@ -48,64 +60,33 @@ class TestEnvelopeSchema:
     @pytest.mark.skipif(not HAS_JSONSCHEMA, reason="jsonschema not installed")
     def test_valid_success_response(self):
         """Test valid success response passes validation."""
-        schema = load_schema("envelope")
-        valid = {
-            "schema_version": 1,
-            "command": "portfolio",
-            "timestamp": "2025-01-20T10:30:00",
-            "success": True,
-            "data": {"total_value": 100000},
-            "error": None,
-        }
-        jsonschema.validate(valid, schema)
+        valid = make_envelope(command="portfolio", data={"total_value": 100000})
+        _get_validator("envelope").validate(valid)
 
     @pytest.mark.skipif(not HAS_JSONSCHEMA, reason="jsonschema not installed")
     def test_valid_error_response(self):
         """Test valid error response passes validation."""
-        schema = load_schema("envelope")
-        valid = {
-            "schema_version": 1,
-            "command": "portfolio",
-            "timestamp": "2025-01-20T10:30:00",
-            "success": False,
-            "data": None,
-            "error": {
-                "message": "Token expired",
-                "type": "AuthError",
-            },
-        }
-        jsonschema.validate(valid, schema)
+        valid = make_envelope(
+            command="portfolio",
+            success=False,
+            data=None,
+            error={"message": "Token expired", "type": "AuthError"},
+        )
+        _get_validator("envelope").validate(valid)
 
     @pytest.mark.skipif(not HAS_JSONSCHEMA, reason="jsonschema not installed")
     def test_invalid_schema_version_fails(self):
         """Test wrong schema version fails validation."""
-        schema = load_schema("envelope")
-        invalid = {
-            "schema_version": 2,  # Wrong version
-            "command": "portfolio",
-            "timestamp": "2025-01-20T10:30:00",
-            "success": True,
-            "data": {},
-            "error": None,
-        }
+        invalid = make_envelope(schema_version=2)
         with pytest.raises(jsonschema.ValidationError):
-            jsonschema.validate(invalid, schema)
+            _get_validator("envelope").validate(invalid)
 
     @pytest.mark.skipif(not HAS_JSONSCHEMA, reason="jsonschema not installed")
     def test_extra_field_fails(self):
         """Test extra fields fail validation."""
-        schema = load_schema("envelope")
-        invalid = {
-            "schema_version": 1,
-            "command": "portfolio",
-            "timestamp": "2025-01-20T10:30:00",
-            "success": True,
-            "data": {},
-            "error": None,
-            "extra_field": "not allowed",
-        }
+        invalid = make_envelope(extra_field="not allowed")
         with pytest.raises(jsonschema.ValidationError):
-            jsonschema.validate(invalid, schema)
+            _get_validator("envelope").validate(invalid)
 
 
 class TestPortfolioSchema:
@@ -118,7 +99,6 @@ class TestPortfolioSchema:
     @pytest.mark.skipif(not HAS_JSONSCHEMA, reason="jsonschema not installed")
     def test_valid_portfolio_data(self):
         """Test valid portfolio data passes validation."""
-        schema = load_schema("portfolio")
         valid = {
             "summary": {
                 "total_value": 150000.00,
@@ -138,12 +118,11 @@ class TestPortfolioSchema:
                 ],
             }
         }
-        jsonschema.validate(valid, schema)
+        _get_validator("portfolio").validate(valid)
 
     @pytest.mark.skipif(not HAS_JSONSCHEMA, reason="jsonschema not installed")
     def test_missing_required_field_fails(self):
         """Test missing required field fails validation."""
-        schema = load_schema("portfolio")
         invalid = {
             "summary": {
                 "total_value": 150000.00,
@@ -151,7 +130,7 @@ class TestPortfolioSchema:
             }
         }
         with pytest.raises(jsonschema.ValidationError):
-            jsonschema.validate(invalid, schema)
+            _get_validator("portfolio").validate(invalid)
 
 
 class TestDoctorSchema:
@@ -164,7 +143,6 @@ class TestDoctorSchema:
     @pytest.mark.skipif(not HAS_JSONSCHEMA, reason="jsonschema not installed")
     def test_valid_doctor_data(self):
         """Test valid doctor data passes validation."""
-        schema = load_schema("doctor")
         valid = {
             "data_dir": "/Users/test/.cli-schwab",
             "portfolio": {
@@ -192,76 +170,35 @@ class TestDoctorSchema:
             },
             "warnings": [],
         }
-        jsonschema.validate(valid, schema)
+        _get_validator("doctor").validate(valid)
 
 
 class TestEnvelopeValidator:
     """Tests for the Python envelope validator in conftest."""
 
-    def test_valid_envelope_passes(self):
-        """Test valid envelope passes Python validator."""
-        valid = {
-            "schema_version": 1,
-            "command": "test",
-            "timestamp": "2025-01-20T10:30:00",
-            "success": True,
-            "data": {},
-            "error": None,
-        }
-        errors = validate_envelope(valid)
-        assert errors == []
-
-    def test_missing_field_detected(self):
-        """Test missing field is detected."""
-        invalid = {
-            "schema_version": 1,
-            "command": "test",
-            # Missing timestamp and success
-        }
-        errors = validate_envelope(invalid)
-        assert len(errors) >= 2
-
-    def test_wrong_schema_version_detected(self):
-        """Test wrong schema version is detected."""
-        invalid = {
-            "schema_version": 99,
-            "command": "test",
-            "timestamp": "2025-01-20T10:30:00",
-            "success": True,
-        }
-        errors = validate_envelope(invalid)
-        assert any("schema_version" in e for e in errors)
-
-    def test_empty_command_detected(self):
-        """Test empty command is detected."""
-        invalid = {
-            "schema_version": 1,
-            "command": "",
-            "timestamp": "2025-01-20T10:30:00",
-            "success": True,
-        }
-        errors = validate_envelope(invalid)
-        assert any("command" in e for e in errors)
-
-    def test_wrong_success_type_detected(self):
-        """Test wrong success type is detected."""
-        invalid = {
-            "schema_version": 1,
-            "command": "test",
-            "timestamp": "2025-01-20T10:30:00",
-            "success": "true",  # Should be boolean
-        }
-        errors = validate_envelope(invalid)
-        assert any("success" in e for e in errors)
-
-    def test_extra_fields_detected(self):
-        """Test extra fields are detected."""
-        invalid = {
-            "schema_version": 1,
-            "command": "test",
-            "timestamp": "2025-01-20T10:30:00",
-            "success": True,
-            "unexpected": "field",
-        }
-        errors = validate_envelope(invalid)
-        assert any("unexpected" in e.lower() or "extra" in e.lower() for e in errors)
+    @pytest.mark.parametrize(
+        ("envelope", "fragments"),
+        [
+            (make_envelope(), ()),
+            (make_envelope(drop=("timestamp", "success")), ("timestamp", "success")),
+            (make_envelope(schema_version=99), ("schema_version",)),
+            (make_envelope(command=""), ("command",)),
+            (make_envelope(success="true"), ("success",)),
+            (make_envelope(unexpected="field"), ("unexpected",)),
+        ],
+        ids=[
+            "valid",
+            "missing_fields",
+            "wrong_schema_version",
+            "empty_command",
+            "wrong_success_type",
+            "extra_field",
+        ],
+    )
+    def test_validate_envelope(self, envelope, fragments):
+        """Test each malformed envelope reports its field and the valid one passes."""
+        errors = validate_envelope(envelope)
+
+        assert bool(errors) == bool(fragments)
+        for fragment in fragments:
+            assert any(fragment in error.lower() for error in errors)
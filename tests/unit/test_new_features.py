@@ -416,7 +416,7 @@ class TestBuildEquityOrder:
         )
 
         assert order["orderType"] == "STOP"
-        assert order["stopPrice"] == "150.0"
+        assert order["stopPrice"] == "150.00"
         assert order["orderStrategyType"] == "SINGLE"
         assert order["session"] == "NORMAL"
         assert order["duration"] == "GOOD_TILL_CANCEL"
@@ -438,14 +438,40 @@ class TestBuildEquityOrder:
         )
 
         assert order["orderType"] == "STOP_LIMIT"
-        assert order["stopPrice"] == "300.0"
-        assert order["price"] == "295.0"
+        assert order["stopPrice"] == "300.00"
+        assert order["price"] == "295.00"
 
         leg = order["orderLegCollection"][0]
         assert leg["instruction"] == "SELL"
         assert leg["quantity"] == 5
         assert leg["instrument"]["symbol"] == "MSFT"
 
+    def test_prices_are_formatted_on_tick_grid(self, wrapper):
+        order = wrapper._build_equity_order(
+            action="BUY",
+            order_type="STOP_LIMIT",
+            symbol="MSFT",
+            quantity=5,
+            stop_price=0.1 + 0.2,
+            limit_price=100.10000000000001,
+        )
+
+        assert order["stopPrice"] == "0.3000"
+        assert order["price"] == "100.10"
+
+    @pytest.mark.parametrize("limit_price", [10.005, 0.12345])
+    def test_off_tick_prices_are_rejected(self, wrapper, limit_price):
+        from src.core.errors import ConfigError
+
+        with pytest.raises(ConfigError, match="not a valid tick"):
+            wrapper._build_equity_order(
+                action="BUY",
+                order_type="LIMIT",
+                symbol="MSFT",
+                quantity=5,
+                limit_price=limit_price,
+            )
+
     def test_trailing_stop_order(self, wrapper):
         order = wrapper._build_equity_order(
             action="SELL",
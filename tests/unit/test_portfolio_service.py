@@ -1,3 +1,5 @@
+import pytest
+
 from src.core.portfolio_service import (
     analyze_allocation,
     build_account_balances,
@@ -5,8 +7,11 @@ from src.core.portfolio_service import (
     build_positions,
 )
 
+pytestmark = pytest.mark.parallel_safe
+
 
-def _accounts_fixture():
+@pytest.fixture(scope="module")
+def accounts():
     return [
         {
             "securitiesAccount": {
@@ -54,8 +59,7 @@ def _account_name(account_number: str) -> str:
     return f"Account (...{account_number[-4:]})"
 
 
-def test_build_portfolio_summary_counts_cash_and_positions():
-    accounts = _accounts_fixture()
+def test_build_portfolio_summary_counts_cash_and_positions(accounts):
     summary = build_portfolio_summary(accounts, _account_name, {"SWGXX"})
 
     assert summary["total_value"] == 15000
@@ -65,8 +69,14 @@ def test_build_portfolio_summary_counts_cash_and_positions():
     assert summary["positions"][0]["symbol"] in {"AAPL", "MSFT"}
 
 
-def test_build_positions_filters_by_symbol():
-    accounts = _accounts_fixture()
+def test_build_portfolio_summary_accepts_streaming_iterator(accounts):
+    summary = build_portfolio_summary(iter(accounts), _account_name, {"SWGXX"})
+
+    assert summary == build_portfolio_summary(accounts, _account_name, {"SWGXX"})
+    assert summary["account_count"] == 2
+
+
+def test_build_positions_filters_by_symbol(accounts):
     positions = build_positions(accounts, _account_name, symbol="AAPL")
 
     assert len(positions) == 1
@@ -74,16 +84,14 @@ def test_build_positions_filters_by_symbol():
     assert positions[0]["percentage_of_portfolio"] > 0
 
 
-def test_build_account_balances_includes_money_market_cash():
-    accounts = _accounts_fixture()
+def test_build_account_balances_includes_money_market_cash(accounts):
     balances = build_account_balances(accounts, _account_name, {"SWGXX"})
 
     assert balances[0]["cash_balance"] == 3000
     assert balances[1]["cash_balance"] == 500
 
 
-def test_analyze_allocation_outputs_expected_keys():
-    accounts = _accounts_fixture()
+def test_analyze_allocation_outputs_expected_keys(accounts):
     analysis = analyze_allocation(accounts)
 
     assert "diversification_score" in analysis
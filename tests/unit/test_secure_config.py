@@ -183,3 +183,22 @@ def test_display_label_generation(tmp_path):
 
         assert "Trading" in display
         assert "...5678" in display  # Last 4 digits
+
+
+def test_get_account_info_by_number(tmp_path):
+    """Test account metadata lookup by account number"""
+    config_path = tmp_path / "accounts.json"
+    test_data = {
+        "accounts": {
+            "first": {"account_number": "11111111", "label": "First"},
+            "second": {"account_number": "22222222", "label": "Second"},
+        },
+    }
+
+    config_path.write_text(json.dumps(test_data))
+    with patch("config.secure_account_config.ACCOUNTS_FILE", config_path):
+        config = SecureAccountConfig()
+
+        assert config.get_account_info_by_number("22222222").alias == "second"
+        assert config.get_account_info_by_number("99999999") is None
+        assert config.get_account_label("11111111") == "First (...1111)"
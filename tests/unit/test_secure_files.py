@@ -1,12 +1,18 @@
 import os
 import stat
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from src.schwab_client._advisor.store import AdvisorStore
 from src.schwab_client._history.store import HistoryStore
 from src.schwab_client.auth_tokens import TokenManager
-from src.schwab_client.secure_files import prepare_sensitive_file, restrict_sqlite_permissions
+from src.schwab_client.secure_files import (
+    ensure_sensitive_dir,
+    prepare_sensitive_file,
+    restrict_sqlite_permissions,
+)
 
 pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX mode assertions")
 
@@ -63,3 +69,15 @@ def test_sqlite_sidecars_are_restricted(tmp_path):
 
     for path in sidecars:
         assert mode(path) == 0o600
+
+
+def test_ensure_sensitive_dir_skips_mkdir_for_existing_dir(tmp_path):
+    token_dir = tmp_path / "tokens"
+    ensure_sensitive_dir(token_dir)
+    token_dir.chmod(0o755)
+
+    with patch.object(Path, "mkdir") as mkdir:
+        ensure_sensitive_dir(token_dir)
+
+    mkdir.assert_not_called()
+    assert mode(token_dir) == 0o700